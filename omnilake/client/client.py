@@ -1,9 +1,10 @@
 import json
 import os
+import sys
 
 from datetime import datetime
 from enum import StrEnum
-from typing import Any, List, Optional, Union, Type
+from typing import Any, List, Optional, Tuple, Union, Type
 
 from da_vinci.core.client_base import RESTClientBase, RESTClientResponse
 
@@ -141,6 +142,29 @@ class RequestBody:
     attribute_definitions: List[RequestBodyAttribute]
     path: str = None
 
+    # Compiled form of attribute_definitions, built once per subclass
+    _compiled_definitions: Tuple[Tuple[str, Any, Any, bool, bool, RequestBodyAttribute], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Compile the attribute definitions of the subclass into a tuple of
+        (name, default, immutable_default, optional, is_datetime, attribute) entries
+        so instantiation doesn't have to walk the attribute objects.
+        """
+        super().__init_subclass__(**kwargs)
+
+        cls._compiled_definitions = tuple(
+            (
+                sys.intern(attr.name),
+                attr.default,
+                attr.immutable_default,
+                bool(attr.optional),
+                attr.attribute_type == RequestAttributeType.DATETIME,
+                attr,
+            )
+            for attr in getattr(cls, 'attribute_definitions', ())
+        )
+
     def __init__(self, **kwargs):
         """
         Initialize the superclass.
@@ -148,34 +172,33 @@ class RequestBody:
         Keyword arguments:
         kwargs -- The attributes of the request
         """
-        self.attributes = {}
+        self.attributes = attributes = {}
 
-        for attr in self.attribute_definitions:
-            attr_val = kwargs.get(attr.name, attr.default)
+        for name, default, immutable_default, optional, is_datetime, attr in self._compiled_definitions:
+            attr_val = kwargs.get(name, default)
 
-            if attr.immutable_default:
+            if immutable_default:
                 # If the attribute is immutable, it cannot be set
                 if attr_val:
-                    raise RequestAttributeError(attribute_name=attr.name, error="Immutable attribute cannot be set")
+                    raise RequestAttributeError(attribute_name=name, error="Immutable attribute cannot be set")
 
-                attr_val = attr.immutable_default
+                attr_val = immutable_default
 
             elif not attr_val:
-                if attr.optional:
-                    attr_val = attr.default
+                if optional:
+                    attr_val = default
 
                 else:
-                    raise RequestAttributeError(attribute_name=attr.name)
+                    raise RequestAttributeError(attribute_name=name)
 
-            elif attr_val:
-                if not attr.validate_type(attr_val):
-                    raise RequestAttributeError(attribute_name=attr.name, error="Invalid type for attribute")
+            elif not attr.validate_type(attr_val):
+                raise RequestAttributeError(attribute_name=name, error="Invalid type for attribute")
 
-            if attr.attribute_type == RequestAttributeType.DATETIME and isinstance(attr_val, datetime):
+            if is_datetime and isinstance(attr_val, datetime):
                 # Convert datetime objects to strings to ensure they are serialized correctly
                 attr_val = attr_val.isoformat()
 
-            self.attributes[attr.name] = attr_val
+            attributes[name] = attr_val
 
     def to_dict(self):
         """
@@ -4,9 +4,61 @@ Omnitizer Commands
 - Index: Indexes the omnilake database by crawling the given directory
 - Question: Takes a question about the project and returns the answer
 '''
+import importlib
 
-from omnilake.client.commands.chain import ChainCommand
-from omnilake.client.commands.index import RefreshIndexCommand
-from omnilake.client.commands.question import QuestionCommand
 
-__all__ = {k.command_name: k for k in [ChainCommand, RefreshIndexCommand, QuestionCommand]}
\ No newline at end of file
+class LazyCommands(dict):
+    """
+    Command registry that only imports a command module the first time the command is accessed.
+    """
+    def __init__(self, command_modules: dict):
+        """
+        Initialize the registry
+
+        Keyword Arguments:
+        command_modules -- map of command name to (module name, class name) tuples
+        """
+        super().__init__()
+
+        self._command_modules = command_modules
+
+    def __contains__(self, command_name: str) -> bool:
+        return command_name in self._command_modules
+
+    def __getitem__(self, command_name: str):
+        if not super().__contains__(command_name):
+            module_name, class_name = self._command_modules[command_name]
+
+            module = importlib.import_module(f'omnilake.client.commands.{module_name}')
+
+            super().__setitem__(command_name, getattr(module, class_name))
+
+        return super().__getitem__(command_name)
+
+    def __iter__(self):
+        return iter(self._command_modules)
+
+    def __len__(self) -> int:
+        return len(self._command_modules)
+
+    def get(self, command_name: str, default=None):
+        if command_name not in self._command_modules:
+            return default
+
+        return self[command_name]
+
+    def items(self):
+        return [(command_name, self[command_name]) for command_name in self._command_modules]
+
+    def keys(self):
+        return self._command_modules.keys()
+
+    def values(self):
+        return [self[command_name] for command_name in self._command_modules]
+
+
+__all__ = LazyCommands({
+    'chain': ('chain', 'ChainCommand'),
+    'index': ('index', 'RefreshIndexCommand'),
+    'question': ('question', 'QuestionCommand'),
+})
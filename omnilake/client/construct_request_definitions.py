@@ -15,6 +15,13 @@ class BasicArchiveConfiguration(RequestBody):
             immutable_default='BASIC',
         ),
 
+        RequestBodyAttribute(
+            'min_content_for_tagging',
+            attribute_type=RequestAttributeType.INTEGER,
+            default=32,
+            optional=True,
+        ),
+
         RequestBodyAttribute(
             'retain_latest_originals_only',
             attribute_type=RequestAttributeType.BOOLEAN,
@@ -23,6 +23,21 @@ from omnilake.client.construct_request_definitions import (
 )
 
 
+_log = logging.getLogger(__name__)
+
+_NO_VALIDATION_CONDITIONS_WARNING = 'neither on_failure or on_success were provided, the validation results will have no effect'
+
+
+def _to_dict_if_body(value: Union[Dict, RequestBody]) -> Dict:
+    """
+    Return the dictionary form of a RequestBody, passing any other value through untouched
+
+    Keyword Arguments:
+    value -- the value to convert
+    """
+    return value.to_dict() if isinstance(value, RequestBody) else value
+
+
 class AddEntry(RequestBody):
     """
     Add an entry to the lake. If the destination_archive is provided, the entry will be
@@ -784,10 +799,13 @@ class LakeRequest(RequestBody):
             if isinstance(processing_instructions, RequestBody):
                 flt_processing_instructions = processing_instructions.to_dict()
     
-            flt_response_config = response_config or {}
+            if response_config is None:
+                flt_response_config = {}
+
+            else:
+                to_dict = getattr(response_config, 'to_dict', None)
 
-            if response_config and isinstance(response_config, RequestBody):
-                flt_response_config = response_config.to_dict()
+                flt_response_config = to_dict() if to_dict is not None else response_config
     
             super().__init__(
                 lookup_instructions=flt_lookup_instructions,
@@ -868,8 +886,8 @@ class LakeChainValidation(RequestBody):
             on_success -- the condition to execute on success
             prompt -- the prompt for the validation
             """
-            if not on_failure and not on_success:
-                logging.warning(' neither on_failure or on_success were provided, the validation results will have no effect')
+            if not on_failure and not on_success and _log.isEnabledFor(logging.WARNING):
+                _log.warning(_NO_VALIDATION_CONDITIONS_WARNING)
     
             super().__init__(
                 model_id=model_id,
@@ -1043,15 +1061,7 @@ class SubmitChainRequest(RequestBody):
         Keyword Arguments:
         chain -- the chain of lake requests to submit
         """
-        flt_requests = []
-
-        for request in chain:
-            if isinstance(request, RequestBody):
-                request = request.to_dict()
-
-            flt_requests.append(request)
-
-        super().__init__(chain=flt_requests)
+        super().__init__(chain=list(map(_to_dict_if_body, chain)))
 
 
 class SubmitLakeRequest(LakeRequest):
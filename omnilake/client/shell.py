@@ -4,6 +4,7 @@ CLI Entry Point
 import argparse
 import logging
 import os
+import sys
 
 from omnilake.client.client import __version__
 
@@ -50,8 +51,11 @@ def main():
 
     subparsers = parser.add_subparsers(dest='command')
 
-    for _, command_class in available_commands.items():
-        command_class.configure_parser(subparsers)
+    # Only import the requested command when one is given, otherwise load them all so help is complete
+    requested_commands = [name for name in available_commands.keys() if name in sys.argv[1:]]
+
+    for command_name in requested_commands or available_commands.keys():
+        available_commands[command_name].configure_parser(subparsers)
 
     args = parser.parse_args()
 
@@ -1,18 +1,14 @@
 """
-Handles the processing of new entries and adds them to the storage.
+Extracts the tags of entries indexed into basic archives.
 """
+import json
 import logging
 
-from datetime import datetime, UTC as utc_tz
-from typing import Dict, Optional, Tuple
+from datetime import datetime, timedelta, UTC as utc_tz
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 from da_vinci.core.immutable_object import ObjectBody
-from da_vinci.core.logging import Logger
-
-from da_vinci.exception_trap.client import ExceptionReporter
-
-from da_vinci.event_bus.client import fn_event_response
-from da_vinci.event_bus.event import Event as EventBusEvent
 
 from omnilake.internal_lib.ai import AI, ModelIDs, AIInvocationResponse
 from omnilake.internal_lib.ai_insights import (
@@ -23,29 +19,37 @@ from omnilake.internal_lib.ai_insights import (
 
 from omnilake.internal_lib.clients import AIStatisticSchema, AIStatisticsCollector
 
-from omnilake.tables.provisioned_archives.client import ArchivesClient
-from omnilake.tables.indexed_entries.client import IndexedEntriesClient
-from omnilake.tables.jobs.client import JobsClient, JobStatus
+from omnilake.tables.provisioned_archives.client import Archive
+from omnilake.tables.indexed_entries.client import IndexedEntry, IndexedEntriesClient
+from omnilake.tables.jobs.client import Job
 
-from omnilake.constructs.archives.basic.runtime.event_definitions import (
-    BasicArchiveGenerateEntryTagsEventBodySchema,
+from omnilake.constructs.archives.basic.tables.entry_tag_cache.client import (
+    CachedEntryTags,
+    EntryTagCacheClient,
 )
 
 
-def extract_tags(content: str, tag_hint: Optional[str] = None, tag_model_id: Optional[str] = None,
-                 tag_model_params: Optional[Dict] = None) -> Tuple[Dict, AIInvocationResponse]:
-    """
-    Uses AI to extract tags from the content.
+_AI = AI()
 
-    Keyword arguments:
-    content -- The content to extract insights from
-    tag_hint -- Special tagging instructions
-    tag_model_id -- The model ID used for tagging
-    tag_model_params -- The model parameters used for tagging
-    """
-    ai = AI()
+_INDEXED_ENTRIES_CLIENT = IndexedEntriesClient()
+
+_TAG_CACHE_CLIENT = EntryTagCacheClient()
+
+_STATS_COLLECTOR = AIStatisticsCollector()
+
+_RESPONSE_PARSER = ResponseParser()
 
-    prompt_definition = """Extract relevant tags from the given content, focusing on:
+
+# How long extracted tags are kept in the tag cache
+_TAG_CACHE_TTL = timedelta(days=7)
+
+# Content shorter than this, once surrounding whitespace is stripped, is not worth an AI invocation
+_DEFAULT_MIN_CONTENT_FOR_TAGGING = 32
+
+# CloudWatch namespace the tag cache hit and miss counts are published under
+_TAG_CACHE_METRIC_NAMESPACE = "OmniLake/BasicArchive"
+
+_TAG_PROMPT_DEFINITION = """Extract relevant tags from the given content, focusing on:
 
 - Proper names (people, places, organizations, products)
 - Specific categories or themes
@@ -75,107 +79,170 @@ Tagging approach:
 - Extract tags based on the categories listed above
 - Review and refine the tag list, ensuring a balanced representation of the content"""
 
+
+def _tag_prompt_definition(tag_hint: Optional[str] = None) -> str:
+    """
+    Returns the tagging instructions, including any special instructions for the archive.
+
+    Keyword arguments:
+    tag_hint -- Special tagging instructions
+    """
     if tag_hint:
-        prompt_definition = f"{prompt_definition}\n\nSPECIAL TAGGING INSTRUCTIONS: {tag_hint}"
+        return f"{_TAG_PROMPT_DEFINITION}\n\nSPECIAL TAGGING INSTRUCTIONS: {tag_hint}"
+
+    return _TAG_PROMPT_DEFINITION
+
 
-    response_definition = AIResponseDefinition(
+@lru_cache(maxsize=32)
+def _tag_response_definition(tag_hint: Optional[str] = None) -> AIResponseDefinition:
+    """
+    Returns the response definition for extracting tags from a single piece of content. Cached since
+    the definition only changes with the tagging instructions.
+
+    Keyword arguments:
+    tag_hint -- Special tagging instructions
+    """
+    return AIResponseDefinition(
         insights=[
             AIResponseInsightDefinition(
                 name="tags",
-                definition=prompt_definition,
+                definition=_tag_prompt_definition(tag_hint),
             ),
         ]
     )
 
-    prompt = response_definition.to_prompt(content)
+
+def record_tag_cache_result(hit: bool):
+    """
+    Publishes the tag cache hit and miss counts as CloudWatch metrics. The counts are written to stdout in
+    the CloudWatch embedded metric format, which Lambda turns into metrics without a CloudWatch API call.
+
+    Keyword arguments:
+    hit -- Whether the tags were found in the tag cache
+    """
+    print(json.dumps({
+        "_aws": {
+            "Timestamp": int(datetime.now(utc_tz).timestamp() * 1000),
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": _TAG_CACHE_METRIC_NAMESPACE,
+                    "Dimensions": [[]],
+                    "Metrics": [
+                        {"Name": "TagCacheHits", "Unit": "Count"},
+                        {"Name": "TagCacheMisses", "Unit": "Count"},
+                    ],
+                },
+            ],
+        },
+        "TagCacheHits": int(hit),
+        "TagCacheMisses": int(not hit),
+    }), flush=True)
+
+
+def extract_tags(content: str, tag_hint: Optional[str] = None, tag_model_id: Optional[str] = None,
+                 tag_model_params: Optional[Dict] = None) -> Tuple[Dict, AIInvocationResponse]:
+    """
+    Uses AI to extract tags from the content.
+
+    Keyword arguments:
+    content -- The content to extract insights from
+    tag_hint -- Special tagging instructions
+    tag_model_id -- The model ID used for tagging
+    tag_model_params -- The model parameters used for tagging
+    """
+    prompt = _tag_response_definition(tag_hint).to_prompt(content)
 
     model_params = tag_model_params or {}
 
-    result = ai.invoke(
+    result = _AI.invoke(
         model_id=tag_model_id or ModelIDs.HAIKU,
         prompt=prompt,
         **model_params,
     )
 
-    parser = ResponseParser()
-
-    parser.feed(result.response)
-
-    return parser.parsed_insights(), result
+    return _RESPONSE_PARSER.parse(result.response), result
 
 
-_FN_NAME = "omnilake.constructs.archives.basic.entry_tag_extration" 
-
-@fn_event_response(function_name=_FN_NAME, exception_reporter=ExceptionReporter(),
-                   logger=Logger(_FN_NAME))
-def handler(event: Dict, context: Dict):
-    """
-    Processes the new entries and adds them to the storage.
+def tag_entry(archive: Archive, entry_id: str, content: str, parent_job: Job,
+              known_entry: Optional[IndexedEntry] = None) -> List[str]:
     """
-    source_event = EventBusEvent.from_lambda_event(event)
-
-    event_body = ObjectBody(body=source_event.body, schema=BasicArchiveGenerateEntryTagsEventBodySchema)
-
-    jobs = JobsClient()
+    Extracts the tags for the entry content and saves them to the indexed entry. Content that was tagged
+    before with the same model and instructions reuses the cached tags.
 
-    parent_job_type = event_body.get('parent_job_type')
-
-    parent_job_id = event_body.get('parent_job_id')
+    Keyword arguments:
+    archive -- The archive the entry is indexed into
+    entry_id -- The ID of the entry
+    content -- The content of the entry
+    parent_job -- The job the AI statistics are recorded against
+    known_entry -- The indexed entry when already loaded by the caller
+    """
+    tag_hint = archive.configuration.get("tag_hint_instructions")
 
-    parent_job = jobs.get(job_type=parent_job_type, job_id=parent_job_id)
+    tag_model_id = archive.configuration.get("tag_model_id")
 
-    tag_extraction_job = parent_job.create_child(job_type='ENTRY_TAG_EXTRACTION')
+    min_content_for_tagging = archive.configuration.get("min_content_for_tagging", _DEFAULT_MIN_CONTENT_FOR_TAGGING)
 
-    jobs.put(parent_job)
+    if len((content or '').strip()) < min_content_for_tagging:
+        logging.debug(f"Content for entry {entry_id} is too small to tag")
 
-    entries = IndexedEntriesClient()
+        tags = []
 
-    with jobs.job_execution(tag_extraction_job, fail_parent=False):
-        archive_id = event_body.get('archive_id')
+    else:
+        cache_key = CachedEntryTags.generate_cache_key(content=content, tag_model_id=tag_model_id, tag_hint=tag_hint)
 
-        entry_id = event_body.get('entry_id')
+        cached_tags = _TAG_CACHE_CLIENT.get(cache_key=cache_key)
 
-        entry = entries.get(archive_id=archive_id, entry_id=entry_id)
+        record_tag_cache_result(hit=bool(cached_tags))
 
-        archives = ArchivesClient()
+        if cached_tags:
+            logging.debug(f"Tag cache hit for entry {entry_id}")
 
-        archive = archives.get(archive_id=archive_id)
+            tags = cached_tags.tags
 
-        content = event_body.get("content")
+        else:
+            logging.debug(f"Tag cache miss for entry {entry_id}")
 
-        insights, invocation_resp = extract_tags(
-            content=content,
-            tag_hint=archive.configuration.get("tag_hint_instructions"),
-            tag_model_id=archive.configuration.get("tag_model_id"),
-        )
+            insights, invocation_resp = extract_tags(
+                content=content,
+                tag_hint=tag_hint,
+                tag_model_id=tag_model_id,
+            )
 
-        logging.debug(f"Invocation response: {invocation_resp}")
+            logging.debug(f"Invocation response: {invocation_resp}")
 
-        stats_collector = AIStatisticsCollector()
+            ai_statistic = ObjectBody(
+                body={
+                    "job_type": parent_job.job_type,
+                    "job_id": parent_job.job_id,
+                    "model_id": invocation_resp.statistics.model_id,
+                    "total_output_tokens": invocation_resp.statistics.output_tokens,
+                    "total_input_tokens": invocation_resp.statistics.input_tokens,
+                },
+                schema=AIStatisticSchema,
+            )
 
-        ai_statistic = ObjectBody(
-            body={
-                "job_type": parent_job_type,
-                "job_id": parent_job_id,
-                "model_id": invocation_resp.statistics.model_id,
-                "total_output_tokens": invocation_resp.statistics.output_tokens,
-                "total_input_tokens": invocation_resp.statistics.input_tokens,
-            },
-            schema=AIStatisticSchema,
-        )
+            _STATS_COLLECTOR.publish(statistic=ai_statistic)
 
-        stats_collector.publish(statistic=ai_statistic)
+            tags = list(filter(None, map(str.strip, insights['tags'].lower().split(','))))
 
-        entry.tags = [tag.lower().strip() for tag in insights['tags'].split(',')]
+            now = datetime.now(utc_tz)
 
-        entries.put(entry)
+            _TAG_CACHE_CLIENT.put(
+                CachedEntryTags(
+                    cache_key=cache_key,
+                    created_on=now,
+                    model_id=invocation_resp.statistics.model_id,
+                    tags=tags,
+                    time_to_live=now + _TAG_CACHE_TTL,
+                )
+            )
 
-        logging.debug(f"Tags complete")
+    entry = known_entry or _INDEXED_ENTRIES_CLIENT.get(archive_id=archive.archive_id, entry_id=entry_id)
 
-    parent_job.status = JobStatus.COMPLETED
+    entry.tags = tags
 
-    parent_job.ended = datetime.now(utc_tz)
+    _INDEXED_ENTRIES_CLIENT.put(entry)
 
-    jobs.put(parent_job)
+    logging.debug(f"Tags complete")
 
-    logging.debug(f"Finished parent job")
\ No newline at end of file
+    return tags
@@ -3,6 +3,7 @@ Index an entry into an archive.
 """
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC as utc_tz
 from typing import Dict
 
@@ -11,7 +12,7 @@ from da_vinci.core.logging import Logger
 
 from da_vinci.exception_trap.client import ExceptionReporter
 
-from da_vinci.event_bus.client import fn_event_response, EventPublisher
+from da_vinci.event_bus.client import fn_event_response
 from da_vinci.event_bus.event import Event as EventBusEvent
 
 from omnilake.internal_lib.clients import RawStorageManager
@@ -21,17 +22,22 @@ from omnilake.internal_lib.event_definitions import (
 from omnilake.internal_lib.naming import SourceResourceName
 
 from omnilake.tables.provisioned_archives.client import ArchivesClient
-from omnilake.tables.indexed_entries.client import (
-    IndexedEntry,
-    IndexedEntriesClient,
-    IndexedEntriesScanDefinition,
-)
+from omnilake.tables.indexed_entries.client import IndexedEntry, IndexedEntriesClient
 from omnilake.tables.jobs.client import Job, JobsClient, JobStatus
 from omnilake.tables.sources.client import SourcesClient
 
-from omnilake.constructs.archives.basic.runtime.event_definitions import (
-    BasicArchiveGenerateEntryTagsEventBodySchema,
-)
+from omnilake.constructs.archives.basic.runtime.generate_tags import tag_entry
+
+
+_SOURCES_CLIENT = SourcesClient()
+
+_JOBS_CLIENT = JobsClient()
+
+_ARCHIVES_CLIENT = ArchivesClient()
+
+_INDEXED_ENTRIES_CLIENT = IndexedEntriesClient()
+
+_RAW_STORAGE_MANAGER = RawStorageManager()
 
 
 def is_latest_entry_for_original(source_resource_name: str, entry_id: str) -> bool:
@@ -41,11 +47,9 @@ def is_latest_entry_for_original(source_resource_name: str, entry_id: str) -> bo
     Keyword arguments:
     source_resource_name -- The source resource name to validate.
     """
-    sources_client = SourcesClient()
-
     source_rn = SourceResourceName.from_resource_name(source_resource_name)
 
-    source = sources_client.get(source_type=source_rn.resource_id.source_type, source_id=source_rn.resource_id.source_id)
+    source = _SOURCES_CLIENT.get(source_type=source_rn.resource_id.source_type, source_id=source_rn.resource_id.source_id)
 
     logging.debug(f"Checking if entry {entry_id} is the latest entry for original source {source_resource_name}")
 
@@ -66,6 +70,9 @@ def handler(event: Dict, context: Dict):
     """
     logging.debug(f'Received request: {event}')
 
+    # Captured once at entry, reused for the timestamps recorded on the indexed entry
+    now = datetime.now(utc_tz)
+
     source_event = EventBusEvent.from_lambda_event(event)
 
     event_body = ObjectBody(
@@ -73,8 +80,6 @@ def handler(event: Dict, context: Dict):
         schema=IndexEntryEventBodySchema,
     )
 
-    jobs = JobsClient()
-
     job_type = event_body.get("parent_job_type")
 
     job_id = event_body.get("parent_job_id")
@@ -82,16 +87,14 @@ def handler(event: Dict, context: Dict):
     if not job_id:
         job = Job(job_type=job_type)
 
-        jobs.put(job)
+        _JOBS_CLIENT.put(job)
 
     else:
-        job = jobs.get(job_type=job_type, job_id=job_id)
+        job = _JOBS_CLIENT.get(job_type=job_type, job_id=job_id)
 
     archive_id = event_body.get("archive_id")
 
-    archives_client = ArchivesClient()
-
-    archive = archives_client.get(archive_id=archive_id)
+    archive = _ARCHIVES_CLIENT.get(archive_id=archive_id, use_cache=True)
 
     retain_latest_originals_only = archive.configuration.get('retain_latest_originals_only')
 
@@ -103,23 +106,14 @@ def handler(event: Dict, context: Dict):
         if is_latest_entry_for_original(original_of_source, entry_id):
             logging.debug(f"Entry {entry_id} is the latest entry for original source {original_of_source} ... continuing indexing")
 
-            scan_def = IndexedEntriesScanDefinition()
-
-            scan_def.add('original_of_source', 'equal', original_of_source) 
-
-            indexed_entries_client = IndexedEntriesClient()
+            stale_entries = _INDEXED_ENTRIES_CLIENT.get_by_original_source(
+                original_of_source=original_of_source,
+                exclude_entry_id=entry_id,
+            )
 
-            matching_indexed_entries = indexed_entries_client.full_scan(scan_def)
+            _INDEXED_ENTRIES_CLIENT.batch_delete(stale_entries)
 
-            for archive_entry in matching_indexed_entries:
-                if archive_entry.entry_id == entry_id:
-                    logging.debug(f"Skipping processed entry")
-
-                    continue
-
-                indexed_entries_client.delete(archive_entry)
-
-                logging.debug(f"Deleted entry index for entry {entry_id} in archive {archive_entry.archive_id}")
+            logging.debug(f"Deleted {len(stale_entries)} stale entry indexes for original source {original_of_source}")
 
         else:
             logging.debug(f"Entry {entry_id} is not the latest entry for original source {original_of_source} ... skipping indexing")
@@ -128,55 +122,51 @@ def handler(event: Dict, context: Dict):
 
             job.ended = datetime.now(utc_tz)
 
-            jobs.put(job)
+            _JOBS_CLIENT.put(job)
 
             return
 
-    indexed_entries = IndexedEntriesClient()
-
-    entry_obj = indexed_entries.get(archive_id=archive_id, entry_id=entry_id)
-
     effective_on = event_body.get("effective_on")
 
-    if not entry_obj:
-        entry_obj = IndexedEntry(
-            archive_id=archive_id,
-            entry_id=entry_id,
-            effective_on=datetime.fromisoformat(effective_on),
-            original_of_source=original_of_source,
-            tags=[],
-        )
+    indexed_entry = IndexedEntry(
+        archive_id=archive_id,
+        entry_id=entry_id,
+        added_on=now,
+        effective_on=datetime.fromisoformat(effective_on),
+        original_of_source=original_of_source,
+        tags=[],
+    )
 
-        indexed_entries.put(entry_obj)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Conditional write avoids a read before the first index of the entry, it is independent of the
+        # content retrieval so the two round trips are overlapped
+        index_put = executor.submit(_INDEXED_ENTRIES_CLIENT.put_if_absent, indexed_entry)
 
-    storage_mgr = RawStorageManager()
+        # Retrieve the entry content from the storage manager
+        entry_content = _RAW_STORAGE_MANAGER.get_entry(entry_id)
 
-    # Retrieve the entry content from the storage manager
-    entry_content = storage_mgr.get_entry(entry_id)
+        # Surface any failure from the index write
+        newly_indexed = index_put.result()
 
     if 'message' in entry_content.response_body:
         raise Exception(f"Error retrieving entry content: {entry_content.response_body['message']}")
 
-    logging.info(f"Sending generate_tags event")
-
-    event_publisher = EventPublisher()
+    # Tags are generated in place since the content is already in memory
+    tag_extraction_job = job.create_child(job_type='ENTRY_TAG_EXTRACTION')
 
-    tags_generate_body = ObjectBody(
-        body={
-            "archive_id": archive_id,
-            "entry_id": entry_id,
-            "content": entry_content.response_body['content'],
-            "parent_job_id": job.job_id,
-            "parent_job_type": job.job_type,
-        },
-        schema=BasicArchiveGenerateEntryTagsEventBodySchema,
-    )
+    _JOBS_CLIENT.put(job)
 
-    event_publisher.submit(
-        event=EventBusEvent(
-            body=tags_generate_body.to_dict(),
-            event_type=tags_generate_body.get("event_type"),
+    with _JOBS_CLIENT.job_execution(tag_extraction_job, fail_parent=False):
+        tag_entry(
+            archive=archive,
+            entry_id=entry_id,
+            content=entry_content.response_body['content'],
+            parent_job=job,
+            known_entry=indexed_entry if newly_indexed else None,
         )
-    )
 
-    # Parent job is completed during the tag generation process
\ No newline at end of file
+    job.status = JobStatus.COMPLETED
+
+    job.ended = datetime.now(utc_tz)
+
+    _JOBS_CLIENT.put(job)
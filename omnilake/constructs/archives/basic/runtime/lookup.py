@@ -2,10 +2,13 @@
 Handles the lookup of data in a basic archive.
 """
 
+import heapq
 import logging
 
 from typing import Dict, List, Optional
 
+import numpy as np
+
 from da_vinci.core.immutable_object import ObjectBody
 from da_vinci.core.logging import Logger
 
@@ -19,10 +22,17 @@ from omnilake.internal_lib.event_definitions import (
     LakeRequestInternalRequestEventBodySchema,
 )
 
-from omnilake.tables.indexed_entries.client import IndexedEntriesClient, IndexedEntriesScanDefinition
+from omnilake.tables.indexed_entries.client import IndexedEntry, IndexedEntriesClient
 from omnilake.tables.jobs.client import JobsClient
 
 
+_INDEXED_ENTRIES_CLIENT = IndexedEntriesClient()
+
+_JOBS_CLIENT = JobsClient()
+
+_EVENT_PUBLISHER = EventPublisher()
+
+
 def _lookup_requested_entries(archive_id: str, max_entries: Optional[int] = None,
                                    prioritized_tags: Optional[List[str]] = None) -> List[str]:
     '''
@@ -33,34 +43,43 @@ def _lookup_requested_entries(archive_id: str, max_entries: Optional[int] = None
     max_entries -- The maximum number of entries to return
     prioritized_tags -- The prioritized tags
     '''
-    found_entries = []
+    if not max_entries:
+        max_entries = 1
 
-    entry_scanner = IndexedEntriesScanDefinition()
+    target_tags = frozenset(prioritized_tags or [])
 
-    entry_scanner.add('archive_id', 'equal', archive_id)
+    # Bounded min-heap of (score, -position, entry ID), only the current top entries are ever held in memory.
+    # The negated position keeps the earliest entry when scores tie.
+    top_entries = []
 
-    entries = IndexedEntriesClient()
+    position = 0
 
-    for page in entries.scanner(entry_scanner):
-        for entry in page:
-            found_entries.append(entry)
+    for page in _INDEXED_ENTRIES_CLIENT.get_tags_by_archive(archive_id=archive_id):
+        if not page:
+            continue
 
-    entry_list_size = len(found_entries)
+        scores = IndexedEntry.calculate_tag_match_percentages([tags for _, tags in page], target_tags)
 
-    if not max_entries:
-        max_entries = 1
+        # Only the page's own top entries can make it into the overall top entries, the stable sort keeps
+        # the earliest entry when scores tie
+        if len(page) > max_entries:
+            candidate_indexes = np.argsort(-scores, kind='stable')[:max_entries]
+
+        else:
+            candidate_indexes = range(len(page))
+
+        for idx in candidate_indexes:
+            scored_entry = (float(scores[idx]), -(position + int(idx)), page[idx][0])
+
+            if len(top_entries) < max_entries:
+                heapq.heappush(top_entries, scored_entry)
 
-    if max_entries < entry_list_size:
-        collected_entries = sorted(
-            found_entries,
-            key=lambda entry_obj: entry_obj.calculate_score(prioritized_tags),
-            reverse=True,
-        )[:max_entries]
+            else:
+                heapq.heappushpop(top_entries, scored_entry)
 
-    else:
-        collected_entries = found_entries
+        position += len(page)
 
-    return [entr.entry_id for entr in collected_entries]
+    return [entry_id for _, _, entry_id in sorted(top_entries, key=lambda scored: scored[:2], reverse=True)]
 
 
 _FN_NAME = "omnilake.constructs.archives.basic.lookup" 
@@ -86,14 +105,12 @@ def basic_lookup(event: Dict, context: Dict):
 
     parent_job_type = event_body["parent_job_type"]
 
-    jobs_client = JobsClient()
-
-    parent_job = jobs_client.get(job_type=parent_job_type, job_id=parent_job_id, consistent_read=True)
+    parent_job = _JOBS_CLIENT.get(job_type=parent_job_type, job_id=parent_job_id, consistent_read=True)
 
     child_job = parent_job.create_child(job_type="ARCHIVE_BASIC_LOOKUP")
 
     # Execute the entry lookup under the child job
-    with jobs_client.job_execution(child_job, fail_parent=True):
+    with _JOBS_CLIENT.job_execution(child_job, fail_parent=True):
 
         retrieval_instructions = event_body.get("request_body")
 
@@ -111,19 +128,20 @@ def basic_lookup(event: Dict, context: Dict):
 
         lake_request_id = event_body.get("lake_request_id")
 
-        response_obj = ObjectBody(
-            body={
-                "entry_ids": retrieved_entries,
-                "lake_request_id": lake_request_id,
-            },
-            schema=LakeRequestLookupResponse,
-        )
+        response_body = {
+            "entry_ids": retrieved_entries,
+            "lake_request_id": lake_request_id,
+        }
+
+        # Validates the response against the schema, the already built body is what gets published
+        # so the (potentially large) entry ID list isn't walked again by to_dict
+        response_obj = ObjectBody(body=response_body, schema=LakeRequestLookupResponse)
 
-        event_publisher = EventPublisher()
+        response_body["event_type"] = response_obj.get("event_type", strict=True)
 
-        event_publisher.submit(
+        _EVENT_PUBLISHER.submit(
             event=EventBusEvent(
-                body=response_obj.to_dict(ignore_unkown=True),
-                event_type=response_obj.get("event_type", strict=True),
+                body=response_body,
+                event_type=response_body["event_type"],
             ),
         )
\ No newline at end of file
@@ -23,6 +23,11 @@ from omnilake.tables.provisioned_archives.client import Archive, ArchivesClient,
 from omnilake.tables.jobs.client import Job, JobsClient, JobStatus
 
 
+_JOBS_CLIENT = JobsClient()
+
+_ARCHIVES_CLIENT = ArchivesClient()
+
+
 @fn_event_response(exception_reporter=ExceptionReporter(), function_name='basic_archive_provisioner',
                    logger=Logger('omnilake.storage.basic.provisioner'))
 def handler(event: Dict, context: Dict) -> Dict:
@@ -31,6 +36,9 @@ def handler(event: Dict, context: Dict) -> Dict:
     """
     logging.debug(f'Received request: {event}')
 
+    # Captured once, the job start and the archive creation describe the same moment
+    now = datetime.now(tz=utz_tz)
+
     source_event = EventBusEvent.from_lambda_event(event)
 
     event_body = ObjectBody(body=source_event.body, schema=ProvisionArchiveEventBodySchema)
@@ -39,18 +47,16 @@ def handler(event: Dict, context: Dict) -> Dict:
 
     job_id = event_body.get("job_id")
 
-    jobs = JobsClient()
-
-    job = jobs.get(job_type=job_type, job_id=job_id)
+    job = _JOBS_CLIENT.get(job_type=job_type, job_id=job_id)
 
     if not job:
         job = Job(job_id=job_id, job_type=job_type)
 
     job.status = JobStatus.IN_PROGRESS
 
-    job.started =  datetime.now(tz=utz_tz)
+    job.started = now
 
-    jobs.put(job)
+    _JOBS_CLIENT.put(job)
 
     description = event_body.get("description")
 
@@ -66,14 +72,14 @@ def handler(event: Dict, context: Dict) -> Dict:
         description=description,
         status=ArchiveStatus.ACTIVE,
         archive_type=archive_type,
+        created_on=now,
+        updated_on=now,
     )
 
-    archives = ArchivesClient()
-
-    archives.put(archive)
+    _ARCHIVES_CLIENT.put(archive)
 
     job.status = JobStatus.COMPLETED
 
     job.ended = datetime.now(tz=utz_tz)
 
-    jobs.put(job)
\ No newline at end of file
+    _JOBS_CLIENT.put(job)
\ No newline at end of file
@@ -28,6 +28,13 @@ class BasicArchiveLookupObjectSchema(ObjectBodySchema):
 class BasicArchiveProvisionObjectSchema(ObjectBodySchema):
     """Basic Archive Provision Object Schema"""
     attributes=[
+        SchemaAttribute(
+            name='min_content_for_tagging',
+            type=SchemaAttributeType.NUMBER,
+            default_value=32,
+            required=False,
+        ),
+
         SchemaAttribute(
             name='retain_latest_originals_only',
             type=SchemaAttributeType.BOOLEAN,
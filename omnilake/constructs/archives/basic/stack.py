@@ -39,6 +39,11 @@ from omnilake.constructs.archives.basic.schemas import (
     BasicArchiveProvisionObjectSchema,
 )
 
+from omnilake.constructs.archives.basic.tables.entry_tag_cache.stack import (
+    CachedEntryTags,
+    EntryTagCacheTable,
+)
+
 
 class LakeConstructArchiveBasicStack(Stack):
     def __init__(self, app_name: str, app_base_image: str, architecture: str,
@@ -61,6 +66,7 @@ class LakeConstructArchiveBasicStack(Stack):
             architecture=architecture,
             required_stacks=[
                 AIStatisticsCollectorStack,
+                EntryTagCacheTable,
                 EventBusStack,
                 JobsTable,
                 IndexedEntriesTable,
@@ -100,7 +106,7 @@ class LakeConstructArchiveBasicStack(Stack):
             index='provisioner.py',
             handler='handler',
             function_name=resource_namer('basic-archive-provisioner', scope=self),
-            memory_size=256,
+            memory_size=1024,
             resource_access_requests=[
                 ResourceAccessRequest(
                     resource_name=Archive.table_name,
@@ -127,20 +133,20 @@ class LakeConstructArchiveBasicStack(Stack):
             timeout=Duration.minutes(1),
         )
 
-        self.entry_tag_generator_event = EventBusSubscriptionFunction(
+        self.entry_index_event = EventBusSubscriptionFunction(
             base_image=self.app_base_image,
-            construct_id='entry_tag_generator',
-            description='Generates tags for an entry.',
+            construct_id='entry_basic_index_event',
+            description='Indexes an entry into a basic archive.',
             entry=self.runtime_path,
-            event_type='omnilake_archive_basic_generate_entry_tags',
-            index='generate_tags.py',
+            event_type=self.registered_request_construct_obj.get_operation_event_name('index'),
+            index='index.py',
             handler='handler',
-            function_name=resource_namer('archive-basic-entry-tag-generator', scope=self),
+            function_name=resource_namer('entry-basic-indexer', scope=self),
             memory_size=512,
             managed_policies=[
                 ManagedPolicy.from_managed_policy_arn(
                     scope=self,
-                    id='entry-tagger-amazon-bedrock-full-access',
+                    id='entry-indexer-amazon-bedrock-full-access',
                     managed_policy_arn='arn:aws:iam::aws:policy/AmazonBedrockFullAccess'
                 ),
             ],
@@ -158,39 +164,10 @@ class LakeConstructArchiveBasicStack(Stack):
                     resource_type=ResourceType.TABLE,
                 ),
                 ResourceAccessRequest(
-                    resource_name=IndexedEntry.table_name,
+                    resource_name=CachedEntryTags.table_name,
                     resource_type=ResourceType.TABLE,
                     policy_name='read_write',
                 ),
-                ResourceAccessRequest(
-                    resource_name=Job.table_name,
-                    resource_type=ResourceType.TABLE,
-                    policy_name='read_write',
-                ),
-            ],
-            scope=self,
-            timeout=Duration.minutes(2),
-        )
-
-        self.entry_index_event = EventBusSubscriptionFunction(
-            base_image=self.app_base_image,
-            construct_id='entry_basic_index_event',
-            description='Indexes an entry into a basic archive.',
-            entry=self.runtime_path,
-            event_type=self.registered_request_construct_obj.get_operation_event_name('index'),
-            index='index.py',
-            handler='handler',
-            function_name=resource_namer('entry-basic-indexer', scope=self),
-            memory_size=512,
-            resource_access_requests=[
-                ResourceAccessRequest(
-                    resource_name='event_bus',
-                    resource_type=ResourceType.ASYNC_SERVICE,
-                ),
-                ResourceAccessRequest(
-                    resource_name=Archive.table_name,
-                    resource_type=ResourceType.TABLE,
-                ),
                 ResourceAccessRequest(
                     resource_name=IndexedEntry.table_name,
                     resource_type=ResourceType.TABLE,
@@ -212,7 +189,7 @@ class LakeConstructArchiveBasicStack(Stack):
                 ),
             ],
             scope=self,
-            timeout=Duration.minutes(2),
+            timeout=Duration.minutes(4),
         )
 
         self.data_retrieval = EventBusSubscriptionFunction(
@@ -224,7 +201,7 @@ class LakeConstructArchiveBasicStack(Stack):
             index='lookup.py',
             handler='basic_lookup',
             function_name=resource_namer('basic-archive-data-retrieval', scope=self),
-            memory_size=512,
+            memory_size=1024,
             resource_access_requests=[
                 ResourceAccessRequest(
                     resource_name=Job.table_name,
@@ -0,0 +1,118 @@
+import hashlib
+
+from datetime import datetime, timedelta, UTC as utc_tz
+from typing import List, Optional, Union
+
+from da_vinci.core.orm import (
+    TableClient,
+    TableObject,
+    TableObjectAttribute,
+    TableObjectAttributeType,
+)
+
+
+class CachedEntryTags(TableObject):
+    table_name = "basic_archive_entry_tag_cache"
+
+    description = "Caches the tags extracted from content so identical content does not require another AI invocation"
+
+    partition_key_attribute = TableObjectAttribute(
+        name="cache_key",
+        attribute_type=TableObjectAttributeType.STRING,
+        description="The hash of the content, tag model and tagging instructions",
+    )
+
+    ttl_attribute = TableObjectAttribute(
+        name="time_to_live",
+        attribute_type=TableObjectAttributeType.DATETIME,
+        description="The date and time the cached tags will expire.",
+        default=lambda: datetime.now(utc_tz) + timedelta(days=7),
+        optional=True,
+    )
+
+    attributes = [
+        TableObjectAttribute(
+            name="created_on",
+            attribute_type=TableObjectAttributeType.DATETIME,
+            description="The date and time the tags were cached.",
+            default=lambda: datetime.now(utc_tz),
+        ),
+
+        TableObjectAttribute(
+            name="model_id",
+            attribute_type=TableObjectAttributeType.STRING,
+            description="The model ID used to extract the tags.",
+            optional=True,
+        ),
+
+        TableObjectAttribute(
+            name="tags",
+            attribute_type=TableObjectAttributeType.STRING_LIST,
+            description="The extracted tags",
+            default=[],
+        ),
+    ]
+
+    def __init__(self, cache_key: str, created_on: Optional[datetime] = None, model_id: Optional[str] = None,
+                 tags: Optional[List[str]] = None, time_to_live: Optional[datetime] = None):
+        """
+        Initialize the CachedEntryTags object.
+
+        Keyword arguments:
+        cache_key -- The hash of the content, tag model and tagging instructions
+        created_on -- The date and time the tags were cached.
+        model_id -- The model ID used to extract the tags.
+        tags -- The extracted tags
+        time_to_live -- The date and time the cached tags will expire.
+        """
+        super().__init__(
+            cache_key=cache_key,
+            created_on=created_on,
+            model_id=model_id,
+            tags=tags,
+            time_to_live=time_to_live,
+        )
+
+    @staticmethod
+    def generate_cache_key(content: str, tag_model_id: Optional[str] = None, tag_hint: Optional[str] = None) -> str:
+        """
+        Generate the cache key for the given content. The model and the tagging instructions are part of
+        the key so changing either invalidates previously cached tags.
+
+        Keyword arguments:
+        content -- The content the tags are extracted from
+        tag_model_id -- The model ID used for tagging
+        tag_hint -- Special tagging instructions
+        """
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+        hint_hash = hashlib.sha256((tag_hint or '').encode('utf-8')).hexdigest()
+
+        return f"{tag_model_id or 'default'}:{hint_hash}:{content_hash}"
+
+
+class EntryTagCacheClient(TableClient):
+    def __init__(self, app_name: Optional[str] = None, deployment_id: Optional[str] = None):
+        super().__init__(
+            app_name=app_name,
+            default_object_class=CachedEntryTags,
+            deployment_id=deployment_id,
+        )
+
+    def get(self, cache_key: str) -> Union[CachedEntryTags, None]:
+        """
+        Get the cached tags for a cache key
+
+        Keyword arguments:
+        cache_key -- The cache key
+        """
+        return self.get_object(partition_key_value=cache_key)
+
+    def put(self, cached_tags: CachedEntryTags) -> None:
+        """
+        Put cached tags
+
+        Keyword arguments:
+        cached_tags -- The cached tags to put
+        """
+        return self.put_object(table_object=cached_tags)
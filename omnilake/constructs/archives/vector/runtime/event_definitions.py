@@ -71,4 +71,20 @@ class VectorArchiveVacuumSchema(ObjectBodySchema):
             required=False,
             default_value="omnilake_archive_vector_vacuum_request",
         ),
-    ]
\ No newline at end of file
+    ]
+
+
+class VectorArchiveMaintenanceSchema(ObjectBodySchema):
+    attributes = [
+        SchemaAttribute(
+            name="archive_id",
+            type=SchemaAttributeType.STRING
+        ),
+
+        SchemaAttribute(
+            name="event_type",
+            type=SchemaAttributeType.STRING,
+            required=False,
+            default_value="omnilake_archive_vector_maintenance_request",
+        ),
+    ]
@@ -23,9 +23,9 @@ from omnilake.internal_lib.ai_insights import (
 
 from omnilake.internal_lib.clients import AIStatisticSchema, AIStatisticsCollector
 
-from omnilake.tables.provisioned_archives.client import ArchivesClient
-from omnilake.tables.indexed_entries.client import IndexedEntriesClient
-from omnilake.tables.jobs.client import JobsClient, JobStatus
+from omnilake.tables.provisioned_archives.client import Archive, ArchivesClient
+from omnilake.tables.indexed_entries.client import IndexedEntry, IndexedEntriesClient
+from omnilake.tables.jobs.client import Job, JobsClient, JobStatus
 
 
 from omnilake.constructs.archives.vector.runtime.event_definitions import (
@@ -33,6 +33,19 @@ from omnilake.constructs.archives.vector.runtime.event_definitions import (
 )
 
 
+_AI = AI()
+
+_JOBS_CLIENT = JobsClient()
+
+_INDEXED_ENTRIES_CLIENT = IndexedEntriesClient()
+
+_ARCHIVES_CLIENT = ArchivesClient()
+
+_STATS_COLLECTOR = AIStatisticsCollector()
+
+_RESPONSE_PARSER = ResponseParser()
+
+
 def extract_tags(content: str, tag_hint: Optional[str] = None, tag_model_id: Optional[str] = None,
                  tag_model_params: Optional[Dict] = None) -> Tuple[Dict, AIInvocationResponse]:
     """
@@ -44,8 +57,6 @@ def extract_tags(content: str, tag_hint: Optional[str] = None, tag_model_id: Opt
     tag_model_id -- The model ID used for tagging
     tag_model_params -- The model parameters used for tagging
     """
-    ai = AI()
-
     prompt_definition = """Extract relevant tags from the given content, focusing on:
 
 - Proper names (people, places, organizations, products)
@@ -92,17 +103,53 @@ Tagging approach:
 
     model_params = tag_model_params or {}
 
-    result = ai.invoke(
+    result = _AI.invoke(
         model_id=tag_model_id or ModelIDs.HAIKU,
         prompt=prompt,
         **model_params,
     )
 
-    parser = ResponseParser()
+    return _RESPONSE_PARSER.parse(result.response), result
+
+
+def tag_entry(archive: Archive, entry: IndexedEntry, content: str, parent_job: Job) -> IndexedEntry:
+    """
+    Extracts the tags for the entry content and saves them to the indexed entry.
+
+    Keyword arguments:
+    archive -- The archive the entry is indexed into
+    entry -- The indexed entry to tag
+    content -- The content of the entry
+    parent_job -- The job the AI statistics are recorded against
+    """
+    insights, invocation_resp = extract_tags(
+        content=content,
+        tag_hint=archive.configuration.get("tag_hint_instructions"),
+        tag_model_id=archive.configuration.get("tag_model_id"),
+    )
+
+    logging.debug(f"Invocation response: {invocation_resp}")
+
+    ai_statistic = ObjectBody(
+        body={
+            "job_type": parent_job.job_type,
+            "job_id": parent_job.job_id,
+            "model_id": invocation_resp.statistics.model_id,
+            "total_output_tokens": invocation_resp.statistics.output_tokens,
+            "total_input_tokens": invocation_resp.statistics.input_tokens,
+        },
+        schema=AIStatisticSchema,
+    )
+
+    _STATS_COLLECTOR.publish(statistic=ai_statistic)
+
+    entry.tags = list(filter(None, map(str.strip, insights['tags'].lower().split(','))))
+
+    _INDEXED_ENTRIES_CLIENT.put(entry)
 
-    parser.feed(result.response)
+    logging.debug(f"Tags complete")
 
-    return parser.parsed_insights(), result
+    return entry
 
 
 _FN_NAME = "omnilake.constructs.archives.vector.entry_tag_extration" 
@@ -117,66 +164,29 @@ def handler(event: Dict, context: Dict):
 
     event_body = ObjectBody(body=source_event.body, schema=VectorArchiveGenerateEntryTagsEventBodySchema)
 
-    jobs = JobsClient()
-
     parent_job_type = event_body.get('parent_job_type')
 
     parent_job_id = event_body.get('parent_job_id')
 
-    parent_job = jobs.get(job_type=parent_job_type, job_id=parent_job_id)
+    parent_job = _JOBS_CLIENT.get(job_type=parent_job_type, job_id=parent_job_id)
 
     tag_extraction_job = parent_job.create_child(job_type='ENTRY_TAG_EXTRACTION')
 
-    jobs.put(parent_job)
-
-    entries = IndexedEntriesClient()
+    _JOBS_CLIENT.put(parent_job)
 
-    with jobs.job_execution(tag_extraction_job, fail_parent=False):
+    with _JOBS_CLIENT.job_execution(tag_extraction_job, fail_parent=False):
         archive_id = event_body.get('archive_id')
 
-        entry_id = event_body.get('entry_id')
-
-        entry = entries.get(archive_id=archive_id, entry_id=entry_id)
-
-        archives = ArchivesClient()
-
-        archive = archives.get(archive_id=archive_id)
-
-        content = event_body.get("content")
-
-        insights, invocation_resp = extract_tags(
-            content=content,
-            tag_hint=archive.configuration.get("tag_hint_instructions"),
-            tag_model_id=archive.configuration.get("tag_model_id"),
-        )
-
-        logging.debug(f"Invocation response: {invocation_resp}")
-
-        stats_collector = AIStatisticsCollector()
-
-        ai_statistic = ObjectBody(
-            body={
-                "job_type": parent_job_type,
-                "job_id": parent_job_id,
-                "model_id": invocation_resp.statistics.model_id,
-                "total_output_tokens": invocation_resp.statistics.output_tokens,
-                "total_input_tokens": invocation_resp.statistics.input_tokens,
-            },
-            schema=AIStatisticSchema,
-        )
-
-        stats_collector.publish(statistic=ai_statistic)
-
-        entry.tags = [tag.lower().strip() for tag in insights['tags'].split(',')]
+        entry = _INDEXED_ENTRIES_CLIENT.get(archive_id=archive_id, entry_id=event_body.get('entry_id'))
 
-        entries.put(entry)
+        archive = _ARCHIVES_CLIENT.get(archive_id=archive_id, use_cache=True)
 
-        logging.debug(f"Tags complete")
+        tag_entry(archive=archive, entry=entry, content=event_body.get("content"), parent_job=parent_job)
 
     parent_job.status = JobStatus.COMPLETED
 
     parent_job.ended = datetime.now(utc_tz)
 
-    jobs.put(parent_job)
+    _JOBS_CLIENT.put(parent_job)
 
     logging.debug(f"Finished parent job")
\ No newline at end of file
@@ -4,14 +4,15 @@ Processes all requests to vectorize text data and store it in vector storage.
 import json
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC as utc_tz
-from typing import Dict, List
+from typing import Dict, List, Optional
 from uuid import uuid4
 
 import boto3
-import lancedb
+import numpy as np
+import pyarrow as pa
 
-from da_vinci.core.global_settings import setting_value
 from da_vinci.core.immutable_object import ObjectBody
 from da_vinci.core.logging import Logger
 
@@ -26,18 +27,20 @@ from omnilake.internal_lib.event_definitions import (
 )
 from omnilake.internal_lib.job_types import JobType
 from omnilake.internal_lib.naming import SourceResourceName
+from omnilake.internal_lib.service_clients import EMBEDDING_CLIENT_CONFIG
 
 from omnilake.constructs.archives.vector.runtime.vector_storage import (
     DocumentChunk,
+    vector_storage_setting,
+    vector_storage_table,
 )
 
-from omnilake.tables.provisioned_archives.client import ArchivesClient
+from omnilake.tables.provisioned_archives.client import Archive, ArchivesClient
 from omnilake.tables.indexed_entries.client import (
     IndexedEntry,
     IndexedEntriesClient,
-    IndexedEntriesScanDefinition,
 )
-from omnilake.tables.jobs.client import JobsClient, JobStatus
+from omnilake.tables.jobs.client import Job, JobsClient, JobStatus
 from omnilake.tables.sources.client import SourcesClient
 from omnilake.constructs.archives.vector.tables.vector_stores.client import VectorStoresClient
 from omnilake.constructs.archives.vector.tables.vector_store_chunks.client import (
@@ -46,35 +49,29 @@ from omnilake.constructs.archives.vector.tables.vector_store_chunks.client impor
 )
 
 from omnilake.constructs.archives.vector.runtime.event_definitions import (
-    VectorArchiveGenerateEntryTagsEventBodySchema,
+    VectorArchiveMaintenanceSchema,
     VectorArchiveVacuumSchema,
 )
+from omnilake.constructs.archives.vector.runtime.generate_tags import tag_entry
 
 
-def text_chunker(text: str, max_chunk_length: int = 1000, overlap: int = 40) -> List[str]:
-    '''
-    Helper function for chunking text based on the max_chunk_length and overlap.
+_BEDROCK = boto3.client(service_name='bedrock-runtime', config=EMBEDDING_CLIENT_CONFIG)
 
-    Keyword arguments:
-    text -- The text to chunk.
-    max_chunk_length -- The maximum length of each chunk.
-    overlap -- The overlap between chunks.
-    '''
-    # Initialize result
-    result = []
-    start = 0
+_JOBS_CLIENT = JobsClient()
 
-    while start < len(text):
-        end = min(start + max_chunk_length, len(text))
-        chunk = text[start:end]
+_INDEXED_ENTRIES_CLIENT = IndexedEntriesClient()
 
-        # Append the chunk
-        result.append(chunk)
+_ARCHIVES_CLIENT = ArchivesClient()
 
-        # Calculate new start position, considering overlap
-        start += max_chunk_length - overlap
+_SOURCES_CLIENT = SourcesClient()
 
-    return result
+_RAW_STORAGE_MANAGER = RawStorageManager()
+
+_VECTOR_STORES_CLIENT = VectorStoresClient()
+
+_VECTOR_STORE_CHUNKS_CLIENT = VectorStoreChunksClient()
+
+_EVENT_PUBLISHER = EventPublisher()
 
 
 def chunk_text(text: str, max_chunk_length: int = 1000, overlap: int = 40) -> List[str]:
@@ -86,64 +83,113 @@ def chunk_text(text: str, max_chunk_length: int = 1000, overlap: int = 40) -> Li
     max_chunk_length -- The maximum length of each chunk.
     overlap -- The overlap between chunks.
     """
-    return text_chunker(text, max_chunk_length, overlap)
+    # Each chunk starts where the previous one started plus the non-overlapping length
+    return [text[start:start + max_chunk_length] for start in range(0, len(text), max_chunk_length - overlap)]
+
 
+# Maximum number of texts the Cohere embedding models accept in a single request
+_MAX_TEXTS_PER_EMBEDDING_REQUEST = 96
 
-def get_embeddings(text: str):
+
+# Maximum number of vacuum event publishes and index deletes sent concurrently
+_MAX_CONCURRENT_VACUUM_REQUESTS = 4
+
+# Maximum number of embedding requests sent concurrently when the texts span multiple requests
+_MAX_CONCURRENT_EMBEDDING_REQUESTS = 8
+
+# Vector store maintenance (compaction and the vector index) is requested each time the store's entry count reaches a multiple of this. The count
+# is updated atomically, so a single indexer requests it for each multiple
+_MAINTENANCE_INTERVAL_ENTRIES = 500
+
+
+def _embed_texts(texts: List[str]) -> List[List[float]]:
     """
-    Get embeddings for a given text.
+    Get embeddings for the given texts with a single request.
 
     Keyword arguments:
-    text -- The text to get embeddings for.
+    texts -- The texts to get embeddings for, no more than the per request maximum.
     """
-    bedrock = boto3.client(service_name='bedrock-runtime')
-    
     body = json.dumps({
-        "texts": [text],
+        "texts": texts,
         "input_type": "search_document"
     })
-    
-    response = bedrock.invoke_model(
+
+    response = _BEDROCK.invoke_model(
         modelId="cohere.embed-multilingual-v3",
         contentType="application/json",
         accept="application/json",
         body=body
     )
-    
+
     response_body = json.loads(response['body'].read())
 
     logging.debug(f"Embedding response: {response_body}")
 
-    embedding = response_body['embeddings'][0]
+    return response_body['embeddings']
 
-    return embedding
 
+def get_embeddings(texts: List[str]) -> List[List[float]]:
+    """
+    Get embeddings for the given texts, sending as many texts per request as the model accepts.
+    The embeddings are returned in the same order as the texts.
 
-def generate_vector_data(entry_id: str, text_chunks: List[str]) -> List[DocumentChunk]:
+    Keyword arguments:
+    texts -- The texts to get embeddings for.
     """
-    Generate vector data for a given text.
+    batches = [
+        texts[batch_start:batch_start + _MAX_TEXTS_PER_EMBEDDING_REQUEST]
+        for batch_start in range(0, len(texts), _MAX_TEXTS_PER_EMBEDDING_REQUEST)
+    ]
+
+    if len(batches) == 1:
+        return _embed_texts(batches[0])
+
+    embeddings = []
+
+    # The requests are network bound, overlapping them keeps the total latency close to a single request
+    with ThreadPoolExecutor(max_workers=min(len(batches), _MAX_CONCURRENT_EMBEDDING_REQUESTS) or 1) as executor:
+        for batch_embeddings in executor.map(_embed_texts, batches):
+            embeddings.extend(batch_embeddings)
+
+    return embeddings
+
+
+def generate_vector_data(entry_id: str, text_chunks: List[str], schema: Optional[pa.Schema] = None,
+                         original_of_source: Optional[str] = None,
+                         effective_on: Optional[datetime] = None) -> pa.RecordBatch:
+    """
+    Generate vector data for a given text. The data is built column-wise as a record batch matching
+    the vector store schema so the vector store can ingest it without converting row by row.
 
     Keyword arguments:
     entry_id -- The entry ID to associate with the vector data.
     text_chunks -- The text chunks to generate vector data for.
+    schema -- The schema of the vector store the data is for, defaults to the DocumentChunk schema.
+    original_of_source -- The source resource name if the entry is original content of a source.
+    effective_on -- The date and time the entry is effective on.
     """
-    embeddings = []
+    schema = schema or DocumentChunk.to_arrow_schema()
 
-    for chunk in text_chunks:
-        embedding_results = get_embeddings(chunk)
+    vector_type = schema.field('vector').type
 
-        embeddings.append(embedding_results)
+    # Vector stores created before half precision storage keep their float32 vectors
+    embeddings = np.asarray(get_embeddings(text_chunks), dtype=vector_type.value_type.to_pandas_dtype())
 
-    data = []
+    effective_on = effective_on or datetime.now(utc_tz)
 
-    for chunk, embed in zip(text_chunks, embeddings):
-        data.append({
-            'entry_id': entry_id,
-            'chunk_id': str(uuid4()),
-            'vector': embed 
-        })
+    columns = {
+        'entry_id': pa.repeat(pa.scalar(entry_id, type=pa.string()), len(text_chunks)),
+        'chunk_id': pa.array([str(uuid4()) for _ in text_chunks], type=pa.string()),
+        'vector': pa.FixedSizeListArray.from_arrays(pa.array(embeddings.ravel()), vector_type.list_size),
+        'original_of_source': pa.repeat(pa.scalar(original_of_source, type=pa.string()), len(text_chunks)),
+        'effective_on': pa.repeat(
+            pa.scalar(int(effective_on.timestamp() * 1_000_000), type=pa.int64()),
+            len(text_chunks),
+        ),
+    }
 
-    return data
+    # Vector stores created before the source columns existed only receive the columns they have
+    return pa.RecordBatch.from_arrays([columns[name] for name in schema.names], schema=schema)
 
 
 def is_latest_entry_for_original(source_resource_name: str, entry_id: str) -> bool:
@@ -153,15 +199,111 @@ def is_latest_entry_for_original(source_resource_name: str, entry_id: str) -> bo
     Keyword arguments:
     source_resource_name -- The source resource name to validate.
     """
-    sources_client = SourcesClient()
-
     source_rn = SourceResourceName.from_resource_name(source_resource_name)
 
-    source = sources_client.get(source_type=source_rn.resource_id.source_type, source_id=source_rn.resource_id.source_id)
+    source = _SOURCES_CLIENT.get(source_type=source_rn.resource_id.source_type, source_id=source_rn.resource_id.source_id)
 
     return source.latest_content_entry_id == entry_id
 
 
+def index_entry_content(archive: Archive, entry_obj: IndexedEntry, content: str, parent_job: Job,
+                        source_event: EventBusEvent):
+    """
+    Store the vectors of the entry content in the archive's vector store and tag the entry.
+
+    Keyword arguments:
+    archive -- The archive the entry is indexed into.
+    entry_obj -- The indexed entry.
+    content -- The content of the entry.
+    parent_job -- The job the entry is indexed under.
+    source_event -- The event that requested the indexing.
+    """
+    archive_id = archive.archive_id
+
+    entry_id = entry_obj.entry_id
+
+    # Get the max chunk length and overlap from the settings
+    max_chunk_length = vector_storage_setting('max_chunk_length')
+
+    chunk_overlap = vector_storage_setting('chunk_overlap')
+
+    # Chunk the text
+    text_chunks = chunk_text(content, max_chunk_length, chunk_overlap)
+
+    # Connect to the vector storage
+    vector_bucket = vector_storage_setting('vector_store_bucket')
+
+    # Get the vector store ID
+    vector_store_id = _VECTOR_STORES_CLIENT.get_vector_store_id(archive_id)
+
+    if not vector_store_id:
+        raise Exception(f"Vector store not found for archive {archive_id}")
+
+    vector_table = vector_storage_table(vector_bucket, vector_store_id)
+
+    # Generate the vector data in the vector store's own vector precision
+    data = generate_vector_data(
+        entry_id,
+        text_chunks=text_chunks,
+        schema=vector_table.schema,
+        original_of_source=entry_obj.original_of_source,
+        effective_on=entry_obj.effective_on,
+    )
+
+    # Add the data to the vector store
+    vector_table.add(data)
+
+    # Record the chunks in the table
+    logging.info(f"Adding {data.num_rows} chunks to vector store {vector_store_id}")
+
+    _VECTOR_STORE_CHUNKS_CLIENT.batch_put([
+        VectorStoreChunk(
+            archive_id=archive_id,
+            entry_id=entry_id,
+            chunk_id=chunk_id,
+            vector_store_id=vector_store_id,
+        )
+        for chunk_id in data.column('chunk_id').to_pylist()
+    ])
+
+    logging.info(f"Saved {data.num_rows} chunks to vector store {vector_store_id}")
+
+    # Update the vector store stats
+    total_entries = _VECTOR_STORES_CLIENT.increment_total_entries(archive_id=archive_id)
+
+    if total_entries % _MAINTENANCE_INTERVAL_ENTRIES == 0:
+        logging.info(f"Requesting maintenance of vector store {vector_store_id} at {total_entries} entries")
+
+        maintenance_event_body = ObjectBody(
+            body={"archive_id": archive_id},
+            schema=VectorArchiveMaintenanceSchema,
+        )
+
+        _EVENT_PUBLISHER.submit(
+            event=source_event.next_event(
+                body=maintenance_event_body.to_dict(),
+                event_type=maintenance_event_body.get("event_type"),
+            )
+        )
+
+    # Tags are generated in place since the content is already in memory
+    tag_extraction_job = parent_job.create_child(job_type='ENTRY_TAG_EXTRACTION')
+
+    try:
+        with _JOBS_CLIENT.job_execution(tag_extraction_job, fail_parent=False):
+            tag_entry(
+                archive=archive,
+                entry=entry_obj,
+                content=content,
+                parent_job=parent_job,
+            )
+
+    except Exception as tag_error:
+        # The failure is recorded on the tag extraction job, raising would retry the event and store the
+        # entry's vectors a second time
+        logging.error(f"Unable to generate tags for entry {entry_id}: {tag_error}")
+
+
 _FN_NAME = 'omnilake.constructs.vector.index_entry'
 
 
@@ -177,6 +319,8 @@ def handler(event: Dict, context: Dict):
     """
     logging.debug(f'Received request: {event}')
 
+    now = datetime.now(utc_tz)
+
     source_event = EventBusEvent.from_lambda_event(event)
 
     event_body = ObjectBody(
@@ -184,22 +328,20 @@ def handler(event: Dict, context: Dict):
         schema=IndexEntryEventBodySchema
     )
 
-    jobs = JobsClient()
-
     job_type = event_body.get("parent_job_type")
 
     job_id = event_body.get("parent_job_id")
 
-    job = jobs.get(job_type=job_type, job_id=job_id)
+    job = _JOBS_CLIENT.get(job_type=job_type, job_id=job_id)
 
     # Create/Save the vectorization job
     vectorize_job = job.create_child(job_type=JobType.INDEX_ENTRY)
 
     vectorize_job.status = JobStatus.IN_PROGRESS
 
-    vectorize_job.started = datetime.now(utc_tz)
+    vectorize_job.started = now
 
-    jobs.put(vectorize_job)
+    _JOBS_CLIENT.put(vectorize_job)
 
     archive_id = event_body.get("archive_id")
 
@@ -207,9 +349,7 @@ def handler(event: Dict, context: Dict):
 
     original_of_source = event_body.get("original_of_source")
 
-    entries = IndexedEntriesClient()
-
-    entry_obj = entries.get(archive_id=archive_id, entry_id=entry_id)
+    entry_obj = _INDEXED_ENTRIES_CLIENT.get(archive_id=archive_id, entry_id=entry_id)
 
     if not entry_obj:
         effective_on = event_body.get("effective_on")
@@ -219,120 +359,66 @@ def handler(event: Dict, context: Dict):
 
         entry_obj = IndexedEntry(
             archive_id=archive_id,
+            added_on=now,
             effective_on=effective_on,
             entry_id=entry_id,
             original_of_source=original_of_source,
             tags=[],
         )
 
-        entries.put(entry_obj)
+        _INDEXED_ENTRIES_CLIENT.put(entry_obj)
 
-    archives_client = ArchivesClient()
-
-    archive = archives_client.get(archive_id)
+    archive = _ARCHIVES_CLIENT.get(archive_id, use_cache=True)
 
     archive_config = archive.configuration
 
     retain_latest_originals_only = archive_config["retain_latest_originals_only"]
 
-    storage_mgr = RawStorageManager()
-
     # Retrieve the entry content from the storage manager
-    entry_content = storage_mgr.get_entry(entry_id)
+    entry_content = _RAW_STORAGE_MANAGER.get_entry(entry_id)
 
     if 'message' in entry_content.response_body:
         raise Exception(f"Error retrieving entry content: {entry_content.response_body['message']}")
 
-    # Get the max chunk length and overlap from the settings
-    max_chunk_length = setting_value(namespace='omnilake::vector_storage', setting_key='max_chunk_length')
-
-    chunk_overlap = setting_value(namespace='omnilake::vector_storage', setting_key='chunk_overlap')
-
-    # Chunk the text
-    text_chunks = chunk_text(entry_content.response_body['content'], max_chunk_length, chunk_overlap)
-
-    # Generate the vector data
-    data = generate_vector_data(entry_id, text_chunks=text_chunks)
-
-    # Connect to the vector storage
-    vector_bucket = setting_value(namespace='omnilake::vector_storage', setting_key='vector_store_bucket')
-
-    db = lancedb.connect(f's3://{vector_bucket}')
-
-    # Get the vector store ID
-    vector_stores = VectorStoresClient()
-
-    archive_id = event_body.get("archive_id")
-
-    vector_stores = VectorStoresClient()
-
-    vector_store_obj = vector_stores.get(archive_id)
-
-    if not vector_store_obj:
-        raise Exception(f"Vector store not found for archive {archive_id}")
-
-    vector_store_id = vector_store_obj.vector_store_id
+    content = entry_content.response_body['content']
 
-    # Add the data to the vector store
-    vector_table = db.open_table(name=vector_store_id)
-
-    vector_table.add(data)
-
-    # Record the chunks in the table
-    chunk_meta_client = VectorStoreChunksClient()
-
-    logging.info(f"Adding {len(data)} chunks to vector store {vector_store_id}")
-
-    for chunk in data:
-        chunk_meta = VectorStoreChunk(
-            archive_id=archive_id,
-            entry_id=chunk['entry_id'],
-            chunk_id=chunk['chunk_id'],
-            vector_store_id=vector_store_id,
+    if content and content.strip():
+        index_entry_content(
+            archive=archive,
+            entry_obj=entry_obj,
+            content=content,
+            parent_job=job,
+            source_event=source_event,
         )
 
-        chunk_meta_client.put(chunk_meta)
-
-    logging.info(f"Saved {len(data)} chunks to vector store {vector_store_id}")
-
-    # Update the vector store stats
-    vector_store_obj.total_entries += 1
-
-    vector_store_obj.total_entries_last_calculated = datetime.now(utc_tz)
-
-    vector_stores.put(vector_store_obj)
+    else:
+        # Nothing to embed, the jobs are still closed out and stale originals still vacuumed
+        logging.info(f"Entry {entry_id} has no content to vectorize ... skipping vector storage")
 
     # Update the job statuses and close them out
-    vectorize_job.status = JobStatus.COMPLETED
+    ended = datetime.now(utc_tz)
 
-    vectorize_job.ended = datetime.now(utc_tz)
+    vectorize_job.status = JobStatus.COMPLETED
 
-    jobs.put(vectorize_job)
+    vectorize_job.ended = ended
 
     job.status = JobStatus.COMPLETED
 
-    job.ended = datetime.now(utc_tz)
+    job.ended = ended
 
-    jobs.put(job)
-
-    event_publisher = EventPublisher()
+    # Both final states go out in a single write
+    _JOBS_CLIENT.batch_put([vectorize_job, job])
 
     # Check if we need to vacuum old entries from the archive
     if retain_latest_originals_only and entry_obj.original_of_source:
-        scan_def = IndexedEntriesScanDefinition()
-
-        scan_def.add('original_of_source', 'equal', entry_obj.original_of_source) 
-
-        archive_entries_client = IndexedEntriesClient()
+        archive_entries = _INDEXED_ENTRIES_CLIENT.get_by_original_source(
+            original_of_source=entry_obj.original_of_source,
+            exclude_entry_id=entry_obj.entry_id,
+        )
 
-        archive_entries = archive_entries_client.full_scan(scan_def)
+        vacuum_events = []
 
         for archive_entry in archive_entries:
-            if archive_entry.entry_id == entry_obj.entry_id:
-                logging.debug(f"Skipping processed entry")
-
-                continue
-
             logging.debug(f"Deleting entry index for entry {archive_entry.entry_id} in archive {archive_entry.archive_id}")
 
             vacuum_event_body = ObjectBody(
@@ -343,36 +429,26 @@ def handler(event: Dict, context: Dict):
                 schema=VectorArchiveVacuumSchema,
             )
 
-            event_publisher.submit(
-                event=source_event.next_event(
+            vacuum_events.append(
+                source_event.next_event(
                     body=vacuum_event_body.to_dict(),
                     event_type=vacuum_event_body.get("event_type"),
                 )
             )
 
-            archive_entries_client.delete(archive_entry)
+        # The vacuum events and the index deletes are independent, overlapping them hides the round trips
+        with ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_VACUUM_REQUESTS) as executor:
+            index_delete = executor.submit(_INDEXED_ENTRIES_CLIENT.batch_delete, archive_entries)
 
-            logging.debug(f"Deleted entry index for entry {archive_entry.entry_id} in archive {archive_entry.archive_id}")
+            published = [executor.submit(_EVENT_PUBLISHER.submit, event=vacuum_event) for vacuum_event in vacuum_events]
 
-    else:
-        logging.debug(f"Not matching conditions for vacuuming {archive.archive_id} ... skipping vacuum check")
+            # Surface any failure from the publishes or the delete
+            for vacuum_publish in published:
+                vacuum_publish.result()
 
-    logging.info(f"Entry {entry_id} has no tags, sending generate_tags event")
-
-    tags_event_body = ObjectBody(
-        body={
-            "archive_id": archive_id,
-            "entry_id": entry_id,
-            "content": entry_content.response_body['content'],
-            "parent_job_id": job.job_id,
-            "parent_job_type": job.job_type,
-        },
-        schema=VectorArchiveGenerateEntryTagsEventBodySchema,
-    )
+            index_delete.result()
 
-    event_publisher.submit(
-        event=source_event.next_event(
-            body=tags_event_body.to_dict(),
-            event_type=tags_event_body.get("event_type"),
-        )
-    )
\ No newline at end of file
+        logging.debug(f"Deleted {len(archive_entries)} stale entry indexes for original source {entry_obj.original_of_source}")
+
+    else:
+        logging.debug(f"Not matching conditions for vacuuming {archive.archive_id} ... skipping vacuum check")
@@ -26,6 +26,13 @@ from omnilake.constructs.archives.vector.runtime.query import VectorStorageSearc
 from omnilake.constructs.archives.vector.tables.vector_stores.client import VectorStoresClient
 
 
+_JOBS_CLIENT = JobsClient()
+
+_VECTOR_STORES_CLIENT = VectorStoresClient()
+
+_EVENT_PUBLISHER = EventPublisher()
+
+
 _FN_NAME = 'omnilake.constructs.vector.lookup'
 
 
@@ -41,39 +48,36 @@ def handler(event: Dict, context: Dict):
     """
     logging.debug(f'Received request: {event}')
 
+    now = datetime.now(tz=utc_tz)
+
     source_event = EventBusEvent.from_lambda_event(event)
 
     event_body = ObjectBody(body=source_event.body, schema=LakeRequestInternalRequestEventBodySchema)
 
-    jobs = JobsClient()
-
     parent_job_type = event_body.get("parent_job_type")
 
     parent_job_id = event_body.get("parent_job_id")
 
-    parent_job = jobs.get(job_type=parent_job_type, job_id=parent_job_id)
+    parent_job = _JOBS_CLIENT.get(job_type=parent_job_type, job_id=parent_job_id)
 
     query_job = parent_job.create_child(job_type='QUERY_REQUEST')
 
-    jobs.put(parent_job)
-
     query_job.status = JobStatus.IN_PROGRESS
 
-    query_job.started = datetime.now(tz=utc_tz)
-
-    jobs.put(query_job)
+    query_job.started = now
 
-    vs_client = VectorStoresClient()
+    # The parent's new child reference and the started query job go out in a single write
+    _JOBS_CLIENT.batch_put([parent_job, query_job])
 
     lookup_instructions = event_body["request_body"]
 
     archive_id = lookup_instructions["archive_id"]
 
-    vector_store = vs_client.get(archive_id=archive_id)
+    vector_store_id = _VECTOR_STORES_CLIENT.get_vector_store_id(archive_id=archive_id)
 
-    if not vector_store:
+    if not vector_store_id:
         raise ValueError(f'Could not find vector store for archive {archive_id}')
-    
+
     vector_store_search = VectorStorageSearch()
 
     query_string = lookup_instructions["query_string"]
@@ -101,9 +105,7 @@ def handler(event: Dict, context: Dict):
         schema=LakeRequestLookupResponse,
     )
 
-    event_publisher = EventPublisher()
-
-    event_publisher.submit(
+    _EVENT_PUBLISHER.submit(
         event=EventBusEvent(
             body=response_obj.to_dict(),
             event_type=response_obj.get("event_type", strict=True),
@@ -114,4 +116,4 @@ def handler(event: Dict, context: Dict):
 
     query_job.ended = datetime.now(tz=utc_tz)
 
-    jobs.put(query_job)
\ No newline at end of file
+    _JOBS_CLIENT.put(query_job)
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Maintains the vector store of an archive outside of the indexing path.
+"""
+import logging
+
+from datetime import timedelta
+from typing import Dict
+
+from da_vinci.core.immutable_object import ObjectBody
+from da_vinci.core.logging import Logger
+
+from da_vinci.exception_trap.client import ExceptionReporter
+
+from da_vinci.event_bus.client import fn_event_response
+from da_vinci.event_bus.event import Event as EventBusEvent
+
+from omnilake.tables.jobs.client import Job, JobsClient
+from omnilake.constructs.archives.vector.tables.vector_stores.client import VectorStoresClient
+
+from omnilake.constructs.archives.vector.runtime.event_definitions import VectorArchiveMaintenanceSchema
+from omnilake.constructs.archives.vector.runtime.vector_storage import (
+    build_vector_index,
+    vector_index_due,
+    vector_storage_setting,
+    vector_storage_table,
+)
+
+
+_JOBS_CLIENT = JobsClient()
+
+_VECTOR_STORES_CLIENT = VectorStoresClient()
+
+
+# How long replaced table versions are kept after compaction, long enough for readers still on them to finish
+_TABLE_VERSION_RETENTION = timedelta(hours=1)
+
+
+def maintain_vector_store(archive_id: str):
+    """
+    Compact the archive's vector store and build its vector index when it is due.
+
+    Keyword arguments:
+    archive_id -- The ID of the archive the vector store belongs to
+    """
+    vector_store = _VECTOR_STORES_CLIENT.get(archive_id=archive_id)
+
+    if not vector_store:
+        raise Exception(f"Vector store not found for archive {archive_id}")
+
+    table = vector_storage_table(vector_storage_setting('vector_store_bucket'), vector_store.vector_store_id)
+
+    # Compaction covers the whole table, merging the small fragments left by per entry appends and rewriting
+    # the fragments with rows deleted by vacuums, so reads no longer apply their deletion files
+    table.compact_files()
+
+    table.cleanup_old_versions(older_than=_TABLE_VERSION_RETENTION)
+
+    total_chunks = table.count_rows()
+
+    if not vector_index_due(table, total_chunks=total_chunks, indexed_chunks=vector_store.indexed_chunks):
+        logging.debug(f"Vector index of vector store {vector_store.vector_store_id} is up to date")
+
+        return
+
+    build_vector_index(table, total_chunks=total_chunks)
+
+    _VECTOR_STORES_CLIENT.set_indexed_chunks(archive_id=archive_id, indexed_chunks=total_chunks)
+
+
+_FN_NAME = 'omnilake.constructs.vector.vector_maintenance'
+
+
+@fn_event_response(exception_reporter=ExceptionReporter(), function_name=_FN_NAME,
+                   logger=Logger(namespace=_FN_NAME))
+def handler(event: Dict, context: Dict):
+    """
+    Lambda handler for the vector store maintenance function. The indexer requests maintenance periodically as
+    entries are added, so the work is never done on the paths that store or vacuum an entry's vectors.
+    """
+    logging.debug(f'Received request: {event}')
+
+    source_event = EventBusEvent.from_lambda_event(event)
+
+    event_body = ObjectBody(
+        body=source_event.body,
+        schema=VectorArchiveMaintenanceSchema,
+    )
+
+    with _JOBS_CLIENT.job_execution(Job(job_type='VECTOR_MAINTENANCE')):
+        maintain_vector_store(archive_id=event_body.get('archive_id'))
@@ -8,9 +8,6 @@ import logging
 from datetime import datetime, UTC as utz_tz
 from typing import Dict
 
-import lancedb
-
-from da_vinci.core.global_settings import setting_value
 from da_vinci.core.immutable_object import ObjectBody
 from da_vinci.core.logging import Logger
 
@@ -29,7 +26,18 @@ from omnilake.tables.provisioned_archives.client import (
 from omnilake.tables.jobs.client import Job, JobsClient, JobStatus
 from omnilake.constructs.archives.vector.tables.vector_stores.client import VectorStore, VectorStoresClient
 
-from omnilake.constructs.archives.vector.runtime.vector_storage import DocumentChunk
+from omnilake.constructs.archives.vector.runtime.vector_storage import (
+    DocumentChunk,
+    vector_storage_connection,
+    vector_storage_setting,
+)
+
+
+_JOBS_CLIENT = JobsClient()
+
+_ARCHIVES_CLIENT = ArchivesClient()
+
+_VECTOR_STORES_CLIENT = VectorStoresClient()
 
 
 _FN_NAME = 'omnilake.constructs.vector.provisioner'
@@ -43,6 +51,8 @@ def handler(event: Dict, context: Dict) -> Dict:
     """
     logging.debug(f'Received request: {event}')
 
+    now = datetime.now(tz=utz_tz)
+
     source_event = EventBusEvent.from_lambda_event(event)
 
     event_body = ObjectBody(
@@ -52,32 +62,30 @@ def handler(event: Dict, context: Dict) -> Dict:
 
     job_id = event_body.get("job_id")
 
-    jobs = JobsClient()
-
-    job = jobs.get(job_type=JobType.CREATE_ARCHIVE, job_id=job_id)
+    job = _JOBS_CLIENT.get(job_type=JobType.CREATE_ARCHIVE, job_id=job_id)
 
     if not job:
         job = Job(job_id=job_id, job_type=JobType.CREATE_ARCHIVE)
 
     job.status = JobStatus.IN_PROGRESS
 
-    job.started =  datetime.now(tz=utz_tz)
+    job.started = now
 
-    jobs.put(job)
+    _JOBS_CLIENT.put(job)
 
-    vector_bucket = setting_value(namespace='omnilake::vector_storage', setting_key='vector_store_bucket')
+    vector_bucket = vector_storage_setting('vector_store_bucket')
 
-    db = lancedb.connect(f's3://{vector_bucket}')
-
-    archives = ArchivesClient()
+    db = vector_storage_connection(vector_bucket)
 
     archive_id = event_body.get("archive_id")
 
-    archive = archives.get(archive_id=archive_id)
+    archive = _ARCHIVES_CLIENT.get(archive_id=archive_id)
 
     initial_vector_store = VectorStore(
         archive_id=archive_id,
         bucket_name=vector_bucket,
+        created_on=now,
+        total_entries_last_calculated=now,
     )
 
     db.create_table(
@@ -85,17 +93,15 @@ def handler(event: Dict, context: Dict) -> Dict:
         schema=DocumentChunk,
     )
 
-    vector_stores = VectorStoresClient()
-
-    vector_stores.put(initial_vector_store)
+    _VECTOR_STORES_CLIENT.put(initial_vector_store)
 
     # Set the archive status to active
     archive.status = ArchiveStatus.ACTIVE
 
-    archives.put(archive)
+    _ARCHIVES_CLIENT.put(archive)
 
     job.status = JobStatus.COMPLETED
 
     job.ended = datetime.now(tz=utz_tz)
 
-    jobs.put(job)
\ No newline at end of file
+    _JOBS_CLIENT.put(job)
\ No newline at end of file
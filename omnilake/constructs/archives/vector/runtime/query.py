@@ -3,170 +3,239 @@ Handles the Vector Storage queries
 """
 import json
 import logging
-import math
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Tuple
 
 import boto3
-import lancedb
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 
-from da_vinci.core.global_settings import setting_value
+from omnilake.internal_lib.service_clients import EMBEDDING_CLIENT_CONFIG
 
 from omnilake.tables.entries.client import Entry, EntriesClient
-from omnilake.tables.indexed_entries.client import IndexedEntriesClient
+from omnilake.tables.indexed_entries.client import IndexedEntry, IndexedEntriesClient
+from omnilake.constructs.archives.vector.tables.query_embedding_cache.client import (
+    CachedQueryEmbedding,
+    QueryEmbeddingCacheClient,
+)
 from omnilake.constructs.archives.vector.tables.vector_stores.client import VectorStoresClient
 
+from omnilake.constructs.archives.vector.runtime.vector_storage import (
+    vector_storage_setting,
+    vector_storage_table,
+)
+
+
+_BEDROCK = boto3.client(service_name='bedrock-runtime', config=EMBEDDING_CLIENT_CONFIG)
+
+_EMBEDDING_CACHE_CLIENT = QueryEmbeddingCacheClient()
+
+_ENTRIES_CLIENT = EntriesClient()
+
+_INDEXED_ENTRIES_CLIENT = IndexedEntriesClient()
+
+_VECTOR_STORES_CLIENT = VectorStoresClient()
+
+
+_EMBEDDING_MODEL_ID = "cohere.embed-multilingual-v3"
+
+
+# Maximum number of texts the embedding model accepts in a single request
+_MAX_TEXTS_PER_EMBEDDING_REQUEST = 96
+
+# How many more results than requested are read from the vector store, in percent, leaving room for
+# the results removed as source duplicates
+_OVERFETCH_PERCENT = 30
+
+# How many IVF partitions a query probes once the vector store has an ANN index, trading recall for latency
+_SEARCH_NPROBES = 20
+
+# The columns read back for every query result
+_RESULT_COLUMNS = ('entry_id', 'original_of_source', 'effective_on')
+
 
 class VectorStorageSearch:
     """
     Vector Storage Query
     """
     def __init__(self):
-        self.storage_bucket_name = setting_value(
-            namespace='omnilake::vector_storage',
-            setting_key='vector_store_bucket',
-        )
+        self.storage_bucket_name = vector_storage_setting('vector_store_bucket')
 
-    def _query(self, db: lancedb.DBConnection, vector_store_id: str, query: str, result_limits: int = 100) -> List[str]:
+    def _query(self, vector_store_id: str, query: str, result_limits: int = 100) -> pa.Table:
         """
-        Load the results from the Vector Storage service.
+        Load the results from the Vector Storage service. Only the entry columns are read back, the
+        vectors themselves are not needed once the search has ranked them.
 
         Keyword arguments:
-        db -- The connection to the Vector Storage service
         vector_store_id -- The ID of the vector store to query
         query -- The query to perform
         result_limits -- The number of results to return
         """
-        table = db.open_table(name=vector_store_id)
+        table = vector_storage_table(self.storage_bucket_name, vector_store_id)
 
-        result = table.search(query).metric("cosine").limit(result_limits).to_list()
+        # Vector stores created before the source columns existed only return the entry ID
+        columns = [name for name in _RESULT_COLUMNS if name in table.schema.names]
 
-        entries = [r["entry_id"] for r in result]
+        search = table.search(query).metric("cosine").nprobes(_SEARCH_NPROBES)
 
-        return entries
+        return search.select(columns).limit(result_limits).to_arrow()
 
-    def _remove_source_duplicates(self, entries: List[Entry]) -> List[Entry]:
+    @staticmethod
+    def _remove_stored_source_duplicates(results: pa.Table) -> List[str]:
         """
-        Remove all entries that are duplicates of the source. Favor the entry with the latest effective date.
+        Remove all results that are duplicates of the source using the source columns stored with the
+        vectors. Favor the result with the latest effective date, the earliest result when they tie.
 
         Keyword arguments:
-        entries -- The entries to remove duplicates from.
+        results -- The query results, including the original_of_source and effective_on columns.
         """
-        # Track all of the original source entries
-        existing_source_entries = {}
-
-        ids_to_remove = set()
-
-        entries_client = EntriesClient()
-
-        for idx, entry in enumerate(entries):
-            # Fetch Entry Table Object
-            entry_global_obj  = entries_client.get(entry_id=entry)
-
-            original_of_source = entry_global_obj.original_of_source
-
-            # If Entry is not original content of a source, skip
-            if not original_of_source:
-                continue
-
-            # If the original source is not in the existing source entries, add it
-            if original_of_source not in existing_source_entries:
-                existing_source_entries[original_of_source] = {
-                    'list_id': idx,
-                    'effective_date': entry_global_obj.effective_on,
-                }
+        sourced_positions = np.flatnonzero(pc.is_valid(results['original_of_source']).to_numpy(zero_copy_only=False))
 
-                continue
+        sources = results['original_of_source'].to_numpy(zero_copy_only=False)
 
-            existing_entry_idx = existing_source_entries[original_of_source]['list_id']
+        effective_on = results['effective_on'].to_numpy(zero_copy_only=False)
 
-            existing_entry_effective_date = existing_source_entries[original_of_source]['effective_date']
+        # Latest effective date first, the stable sort keeps the earliest result first on ties
+        ordered_positions = sourced_positions[np.argsort(-effective_on[sourced_positions], kind='stable')]
 
-            existing_entry = entries[existing_entry_idx]
+        _, latest_idx = np.unique(sources[ordered_positions], return_index=True)
 
-            if existing_entry_effective_date < entry_global_obj.effective_on:
-                logging.debug(f'Removing duplicate source entry {existing_entry} in favor of {entry}.')
+        keep = np.ones(results.num_rows, dtype=bool)
 
-                ids_to_remove.add(existing_entry_idx)
+        keep[sourced_positions] = False
 
-                existing_source_entries[original_of_source]['list_id'] = idx
+        keep[ordered_positions[latest_idx]] = True
 
-                existing_source_entries[original_of_source]['effective_date'] = entry_global_obj.effective_on
+        return results['entry_id'].filter(pa.array(keep)).to_pylist()
 
-            else:
-                logging.debug(f'Removing duplicate source entry {entry} in favor of {existing_entry}.')
+    def _remove_source_duplicates(self, entries: List[Entry]) -> List[Entry]:
+        """
+        Remove all entries that are duplicates of the source. Favor the entry with the latest effective date.
 
-                ids_to_remove.add(idx)
+        Keyword arguments:
+        entries -- The entries to remove duplicates from.
+        """
+        # Fetch all of the Entry Table Objects in one batch instead of one request per entry
+        entries_map = _ENTRIES_CLIENT.batch_get(entry_ids=entries)
+
+        entry_objs = [entries_map[entry] for entry in entries]
+
+        # Lay the entry details out in the same columns stored with newer vector stores, so both take the
+        # same vectorized de-duplication
+        results = pa.table({
+            'entry_id': pa.array(entries, type=pa.string()),
+            'original_of_source': pa.array(
+                [entry_obj.original_of_source or None for entry_obj in entry_objs],
+                type=pa.string(),
+            ),
+            'effective_on': pa.array(
+                [int(entry_obj.effective_on.timestamp() * 1_000_000) for entry_obj in entry_objs],
+                type=pa.int64(),
+            ),
+        })
 
-        return [entry for idx, entry in enumerate(entries) if idx not in ids_to_remove]
+        return self._remove_stored_source_duplicates(results=results)
 
-    def _sort_entries_by_tag(self, archive_id: str, entries: List[Entry], target_tags: List[str]) -> List[Entry]:
+    def _sort_entries_by_tag(self, archive_id: str, entries: List[Entry], target_tags: List[str],
+                             entry_tags: Optional[Dict[str, List[str]]] = None) -> List[Entry]:
         """
-        Sort the entries based on the target tags.
+        Sort the entries based on the target tags. The entries are scored in a single vectorized pass,
+        entries with the same score keep their vector search order.
 
         Keyword arguments:
         archive_id -- The ID of the archive to sort against.
         entries -- The entry_ids to sort.
         target_tags -- The target tags to sort against.
+        entry_tags -- The already fetched tags of the entry indexes, keyed by entry ID
         """
-        indexed_entries = IndexedEntriesClient()
-
-        entries_to_sort = []
+        if entry_tags is None:
+            entry_tags = _INDEXED_ENTRIES_CLIENT.batch_get_tags(archive_id=archive_id, entry_ids=entries)
 
         for entry in entries:
-            logging.debug(f'Fetching entry ID: {entry}')
+            if entry not in entry_tags:
+                raise ValueError(f'Could not find entry index for {entry} in archive {archive_id}')
 
-            entry_index = indexed_entries.get(
-                archive_id=archive_id,
-                entry_id=entry,
-            )
+        scores = IndexedEntry.calculate_tag_match_percentages(
+            tag_lists=[entry_tags[entry] for entry in entries],
+            target_tags=target_tags,
+        )
 
-            logging.debug(f'Entry index details: {entry_index}')
+        return [entries[idx] for idx in np.argsort(-scores, kind='stable')]
 
-            if not entry_index:
-                raise ValueError(f'Could not find entry index for {entry} in archive {archive_id}')
+    @staticmethod
+    def text_embeddings(texts: List[str]) -> List[List[float]]:
+        """
+        Create the query embeddings for multiple texts, sending up to the model's per request limit of
+        texts with each request. Returns the embeddings in the same order as the texts.
+
+        Keyword Arguments:
+            texts: The texts to embed
+        """
+        embeddings = []
+
+        for batch_start in range(0, len(texts), _MAX_TEXTS_PER_EMBEDDING_REQUEST):
+            body = json.dumps({
+                "texts": texts[batch_start:batch_start + _MAX_TEXTS_PER_EMBEDDING_REQUEST],
+                "input_type": "search_query"
+            })
+
+            response = _BEDROCK.invoke_model(
+                modelId=_EMBEDDING_MODEL_ID,
+                contentType="application/json",
+                accept="application/json",
+                body=body
+            )
 
-            entries_to_sort.append(entry_index)
+            response_body = json.loads(response['body'].read())
 
-        sorted_entries = sorted(
-            entries_to_sort,
-            key=lambda entry_obj: entry_obj.calculate_score(target_tags),
-            reverse=True,
-        )
+            logging.debug(f'Embedding response: {response_body}')
 
-        result = [entry.entry_id for entry in sorted_entries]
+            embeddings.extend(response_body['embeddings'])
 
-        return result
+        return embeddings
 
     @staticmethod
-    def text_embedding(text: str):
+    @lru_cache(maxsize=1024)
+    def _cached_text_embedding(text: str) -> Tuple[float, ...]:
         """
-        Create a prompt embedding for the query.
+        Get the query embedding from the embedding cache table, only embedding the text when it was not
+        embedded recently. Results are also kept in memory for the life of the execution environment.
 
         Keyword Arguments:
-            prompt: The prompt to query
+            text: The text to embed
         """
-        bedrock = boto3.client(service_name='bedrock-runtime')
+        cache_key = CachedQueryEmbedding.generate_cache_key(query=text, model_id=_EMBEDDING_MODEL_ID)
 
-        body = json.dumps({
-            "texts": [text],
-            "input_type": "search_query"
-        })
-        
-        response = bedrock.invoke_model(
-            modelId="cohere.embed-multilingual-v3",
-            contentType="application/json",
-            accept="application/json",
-            body=body
+        cached_embedding = _EMBEDDING_CACHE_CLIENT.get(cache_key=cache_key)
+
+        if cached_embedding:
+            logging.debug(f'Embedding cache hit for query "{text}"')
+
+            return tuple(cached_embedding.embedding_values())
+
+        embedding = VectorStorageSearch.text_embeddings([text])[0]
+
+        _EMBEDDING_CACHE_CLIENT.put(
+            CachedQueryEmbedding(
+                cache_key=cache_key,
+                embedding=CachedQueryEmbedding.encode_embedding(embedding),
+            )
         )
-    
-        response_body = json.loads(response['body'].read())
 
-        logging.debug(f'Embedding response: {response_body}')
+        return tuple(embedding)
 
-        embedding = response_body['embeddings'][0]
+    @classmethod
+    def text_embedding(cls, text: str) -> List[float]:
+        """
+        Create a prompt embedding for the query, reusing the embedding of a recently seen query.
 
-        return embedding
+        Keyword Arguments:
+            text: The text to embed
+        """
+        return list(cls._cached_text_embedding(text))
 
     def execute(self, archive_id: str, query_string: str, max_entries: int, prioritize_tags: List[str] = None) -> List[str]:
         """
@@ -174,43 +243,55 @@ class VectorStorageSearch:
         """
         query = self.text_embedding(query_string)
 
-        vector_stores = VectorStoresClient()
-
-        vector_store = vector_stores.get(archive_id=archive_id)
+        vector_store_id = _VECTOR_STORES_CLIENT.get_vector_store_id(archive_id=archive_id)
 
-        if not vector_store:
+        if not vector_store_id:
             raise ValueError(f'Could not find vector store for archive {archive_id}')
 
-        vector_store_id = vector_store.vector_store_id
-
         logging.info(f'Querying vector storage "{vector_store_id}" with "{query}"')
 
-        db = lancedb.connect(f's3://{self.storage_bucket_name}')
-
-        resulting_entries = self._query(
-            db=db,
+        results = self._query(
             query=query,
-            result_limits=max_entries + math.ceil(max_entries * 0.3), # Set query limit to 30% more than the max entries
+            result_limits=max_entries + (max_entries * _OVERFETCH_PERCENT + 99) // 100,
             vector_store_id=vector_store_id,
         )
 
-        logging.info(f'Vector storage query returned {len(resulting_entries)} results.')
+        logging.info(f'Vector storage query returned {results.num_rows} results.')
 
-        if not resulting_entries:
+        if not results.num_rows:
             return []
 
-        de_duplicated_entries = self._remove_source_duplicates(entries=resulting_entries)
+        resulting_entries = results['entry_id'].to_pylist()
 
-        if prioritize_tags:
-            sorted_entries = self._sort_entries_by_tag(
+        if 'original_of_source' in results.column_names:
+            remove_source_duplicates = partial(self._remove_stored_source_duplicates, results=results)
+
+        else:
+            remove_source_duplicates = partial(self._remove_source_duplicates, entries=resulting_entries)
+
+        if not prioritize_tags:
+            de_duplicated_entries = remove_source_duplicates()
+
+            return de_duplicated_entries[:max_entries]
+
+        # The entry tags don't depend on the de-duplication, fetching them for every result lets the
+        # two batch reads run at the same time instead of one after the other
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            entry_tags_fetch = executor.submit(
+                _INDEXED_ENTRIES_CLIENT.batch_get_tags,
                 archive_id=archive_id,
-                entries=de_duplicated_entries,
-                target_tags=prioritize_tags,
+                entry_ids=resulting_entries,
             )
 
-            finalized_entries = sorted_entries[:max_entries]
+            de_duplicated_entries = remove_source_duplicates()
 
-        else:
-            finalized_entries = de_duplicated_entries[:max_entries]
+            entry_tags = entry_tags_fetch.result()
+
+        sorted_entries = self._sort_entries_by_tag(
+            archive_id=archive_id,
+            entries=de_duplicated_entries,
+            target_tags=prioritize_tags,
+            entry_tags=entry_tags,
+        )
 
-        return finalized_entries
\ No newline at end of file
+        return sorted_entries[:max_entries]
\ No newline at end of file
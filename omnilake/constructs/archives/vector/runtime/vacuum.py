@@ -1,10 +1,8 @@
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 
-import lancedb
-
-from da_vinci.core.global_settings import setting_value
 from da_vinci.core.immutable_object import ObjectBody
 from da_vinci.core.logging import Logger
 
@@ -19,6 +17,33 @@ from omnilake.constructs.archives.vector.tables.vector_stores.client import Vect
 from omnilake.constructs.archives.vector.tables.vector_store_chunks.client import VectorStoreChunksClient
 
 from omnilake.constructs.archives.vector.runtime.event_definitions import VectorArchiveVacuumSchema
+from omnilake.constructs.archives.vector.runtime.vector_storage import (
+    vector_storage_setting,
+    vector_storage_table,
+)
+
+
+_JOBS_CLIENT = JobsClient()
+
+_INDEXED_ENTRIES_CLIENT = IndexedEntriesClient()
+
+_VECTOR_STORES_CLIENT = VectorStoresClient()
+
+_VECTOR_STORE_CHUNKS_CLIENT = VectorStoreChunksClient()
+
+
+def _sql_quote(value: str) -> str:
+    """
+    Quote a value as a string literal for a vector store filter predicate. Values containing a quote
+    are rejected rather than escaped, chunk IDs never contain one.
+
+    Keyword arguments:
+    value -- The value to quote
+    """
+    if "'" in value:
+        raise ValueError(f"Unable to use value containing a quote in a filter predicate: {value}")
+
+    return f"'{value}'"
 
 
 def delete_entry_index(entry_id: str, archive_id: str):
@@ -29,41 +54,47 @@ def delete_entry_index(entry_id: str, archive_id: str):
     entry_id -- The ID of the entry to delete
     archive_id -- The ID of the archive to delete the entry from
     """
-    vector_bucket = setting_value(namespace='omnilake::vector_storage', setting_key='vector_store_bucket')
+    vector_bucket = vector_storage_setting('vector_store_bucket')
 
-    vector_store_chunks = VectorStoreChunksClient()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # The chunk lookup is independent of opening the vector store, the two round trips are overlapped
+        chunks_fetch = executor.submit(
+            _VECTOR_STORE_CHUNKS_CLIENT.get_chunks_by_archive_and_entry,
+            archive_id,
+            entry_id,
+        )
 
-    chunk_objs = vector_store_chunks.get_chunks_by_archive_and_entry(archive_id, entry_id)
+        vector_store_id = _VECTOR_STORES_CLIENT.get_vector_store_id(archive_id=archive_id)
 
-    # Load the vector store bucket information
-    db = lancedb.connect(f's3://{vector_bucket}')
+        if not vector_store_id:
+            raise Exception(f"Vector store not found for archive {archive_id}")
 
-    # Iterate over the organized chunks and remove the entries from the vector store
-    vector_stores = VectorStoresClient()
+        table = vector_storage_table(vector_bucket, vector_store_id)
 
-    vector_store = vector_stores.get(
-        archive_id=archive_id,
-    )
+        chunk_objs = chunks_fetch.result()
 
-    table = db.open_table(name=vector_store.vector_store_id)
+    if chunk_objs:
+        chunk_id_predicate = "chunk_id IN ({})".format(", ".join(_sql_quote(chunk.chunk_id) for chunk in chunk_objs))
 
-    for chunk in chunk_objs:
-        from_entry = table.search().where(f"chunk_id == '{chunk.chunk_id}'").to_list()
+        # A single filtered read of only the chunk ID column checks which chunks are still in the vector store
+        stored_chunks = table.search().where(chunk_id_predicate).select(['chunk_id']).limit(len(chunk_objs)).to_arrow()
 
-        if len(from_entry) == 0:
-            logging.error(f"Could not find entry for chunk: {chunk.chunk_id}")
+        stored_chunk_ids = set(stored_chunks.column('chunk_id').to_pylist())
 
-            continue
+        for chunk in chunk_objs:
+            if chunk.chunk_id not in stored_chunk_ids:
+                logging.error(f"Could not find entry for chunk: {chunk.chunk_id}")
 
-        # Remove the entry from the old vector store
-        table.delete(f"chunk_id == '{chunk.chunk_id}'")
+        # Remove all of the entry's chunks from the vector store at once
+        if stored_chunk_ids:
+            # The deletion files are folded back into the table by the next vector store maintenance run
+            table.delete(chunk_id_predicate)
 
-        # Update the vector store chunk table
-        vector_store_chunks.delete(chunk)
+            # Only entries with stored vectors were counted by the indexer, entries without content never were
+            _VECTOR_STORES_CLIENT.increment_total_entries(archive_id=archive_id, amount=-1)
 
-    vector_store.total_entries -= 1
-
-    vector_stores.put(vector_store)
+        # Update the vector store chunk table
+        _VECTOR_STORE_CHUNKS_CLIENT.batch_delete([chunk for chunk in chunk_objs if chunk.chunk_id in stored_chunk_ids])
 
 
 _FN_NAME = 'omnilake.constructs.vector.vector_vacuum'
@@ -84,25 +115,21 @@ def handler(event: Dict, context: Dict):
         schema=VectorArchiveVacuumSchema,
     )
 
-    jobs = JobsClient()
-
     archive_id = event_body.get('archive_id')
 
     entry_id = event_body.get('entry_id')
 
     # TODO: Find all previous entries that are no longer needed and remove them and decrement the total_entries count
 
-    with jobs.job_execution(Job(job_type='VECTOR_VACUUM')):
+    with _JOBS_CLIENT.job_execution(Job(job_type='VECTOR_VACUUM')):
         logging.debug(f"Deleting entry index for entry {entry_id} in archive {archive_id}")
 
         delete_entry_index(entry_id, archive_id)
 
-        archive_entries_client = IndexedEntriesClient()
-
-        archive_entry = archive_entries_client.get(entry_id=entry_id, archive_id=archive_id)
+        archive_entry = _INDEXED_ENTRIES_CLIENT.get(entry_id=entry_id, archive_id=archive_id)
 
         if archive_entry:
-            archive_entries_client.delete(archive_entry)
+            _INDEXED_ENTRIES_CLIENT.delete(archive_entry)
 
             logging.debug(f"Deleted entry index for entry {entry_id} in archive {archive_id}")
 
@@ -2,62 +2,132 @@
 Vector Storage Definitions
 """
 import logging
+import math
 
-from dataclasses import dataclass, field
-from typing import List 
+from datetime import timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import lancedb
+import pyarrow as pa
 
 from lancedb.pydantic import LanceModel, Vector
+from lancedb.table import Table
 
+from da_vinci.core.global_settings import setting_value
 
-class DocumentChunk(LanceModel):
+
+# How stale a cached table handle may be before it checks for writes made by other functions
+_READ_CONSISTENCY_INTERVAL = timedelta(seconds=10)
+
+# Connections and table handles are opened once per execution environment so warm invocations reuse them
+_CONNECTIONS: Dict[str, lancedb.DBConnection] = {}
+
+_TABLES: Dict[Tuple[str, str], Table] = {}
+
+# Below this many chunks a flat search is fast enough and there is too little data to train an ANN index
+_MIN_CHUNKS_FOR_VECTOR_INDEX = 10_000
+
+# The name LanceDB gives the index created on the vector column
+_VECTOR_INDEX_NAME = 'vector_idx'
+
+
+@lru_cache(maxsize=8)
+def vector_storage_setting(setting_key: str):
     """
-    Document chunk model.
+    Returns a vector storage setting, reading it from the settings table only the first time it is
+    requested in the execution environment. Settings changes are picked up by new execution environments.
+
+    Keyword arguments:
+    setting_key -- The key of the setting
     """
-    entry_id: str
-    chunk_id: str
-    vector: Vector(dim=1024) # type: ignore
+    return setting_value(namespace='omnilake::vector_storage', setting_key=setting_key)
+
+
+def vector_storage_connection(bucket_name: str) -> lancedb.DBConnection:
+    """
+    Returns the connection to the vector storage in the given bucket, connecting on first use.
+
+    Keyword arguments:
+    bucket_name -- The name of the vector storage bucket
+    """
+    if bucket_name not in _CONNECTIONS:
+        _CONNECTIONS[bucket_name] = lancedb.connect(
+            f's3://{bucket_name}',
+            read_consistency_interval=_READ_CONSISTENCY_INTERVAL,
+        )
+
+    return _CONNECTIONS[bucket_name]
 
 
-@dataclass
-class VectorRankingItem:
-    vector_storage_id: str
-    tags: List[str] = field(default_factory=list)
+def vector_storage_table(bucket_name: str, vector_store_id: str) -> Table:
+    """
+    Returns the table of a vector store, opening it on first use so its manifest isn't read again
+    by every invocation.
 
-    def calculate_match(self, expected_tags: List[str]) -> int:
-        """
-        Calculate the match between the expected tags and the tags of the vector.
+    Keyword arguments:
+    bucket_name -- The name of the vector storage bucket
+    vector_store_id -- The ID of the vector store
+    """
+    table_key = (bucket_name, vector_store_id)
 
-        Keyword arguments:
-        expected_tags -- The expected tags to rank the vector against.
-        """
-        logging.debug(f"Calculating match between {expected_tags} and {self.tags}")
+    if table_key not in _TABLES:
+        _TABLES[table_key] = vector_storage_connection(bucket_name).open_table(name=vector_store_id)
 
-        return len(set(expected_tags) & set(self.tags)) / len(expected_tags)
+    return _TABLES[table_key]
 
 
-def vector_ranker(expected_tags: List[str], items: List[VectorRankingItem], max_length: int = 1) -> List[VectorRankingItem]:
+def vector_index_due(table: Table, total_chunks: int, indexed_chunks: Optional[int] = None) -> bool:
     """
-    Rank the items based on the expected tags.
+    Whether the ANN index of a vector store table should be built. The index is first built once the table
+    is large enough, then rebuilt every time the table doubles in size so the index partitions keep up with
+    the data. Chunks added since the last build are still found, LanceDB searches them flat.
 
     Keyword arguments:
-    expected_tags -- The expected tags to rank the vectors against.
-    items -- The items to rank.
-    max_length -- The maximum number of items to return.
+    table -- The vector store table
+    total_chunks -- The number of chunks in the table
+    indexed_chunks -- The number of chunks in the table when the index was last built
     """
-    ranked_items = sorted(items, key=lambda item: item.calculate_match(expected_tags), reverse=True)
+    if total_chunks < _MIN_CHUNKS_FOR_VECTOR_INDEX:
+        return False
+
+    has_index = any(index.name == _VECTOR_INDEX_NAME for index in table.list_indices())
 
-    return ranked_items[:max_length]
+    if not has_index or not indexed_chunks:
+        return True
 
+    return total_chunks >= indexed_chunks * 2
 
-def calculate_tag_match_percentage(object_tags: List[str], target_tags: List[str]) -> int:
+
+def build_vector_index(table: Table, total_chunks: int) -> None:
     """
-    Calculate the match percentage between the object's tags and the target tags.
+    Build, or replace, the ANN index of a vector store table. Training the index reads every vector in the
+    table, so it is only run by the vector store maintenance function.
 
     Keyword arguments:
-    object_tags -- The list of tags to compare
-    target_tags -- The list of tags to compare
+    table -- The vector store table
+    total_chunks -- The number of chunks in the table
     """
-    matching_tags = set(object_tags) & set(target_tags)
+    logging.info(f"Building vector index over {total_chunks} chunks")
+
+    table.create_index(
+        metric='cosine',
+        vector_column_name='vector',
+        index_type='IVF_PQ',
+        num_partitions=int(math.sqrt(total_chunks)),
+        num_sub_vectors=32,
+        replace=True,
+    )
 
-    # Calculate the match percentage
-    return len(matching_tags) / len(target_tags) * 100
\ No newline at end of file
+
+class DocumentChunk(LanceModel):
+    """
+    Document chunk model. Vectors are stored in half precision, halving their storage and read size. The
+    entry's original source and effective date (in microseconds since the epoch) are stored with every
+    chunk so source duplicates can be removed from search results without looking up the entries.
+    """
+    entry_id: str
+    chunk_id: str
+    vector: Vector(dim=1024, value_type=pa.float16()) # type: ignore
+    effective_on: int
+    original_of_source: Optional[str] = None
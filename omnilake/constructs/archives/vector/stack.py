@@ -42,6 +42,10 @@ from omnilake.constructs.archives.vector.schemas import (
     VectorArchiveProvisionObjectSchema,
 )
 
+from omnilake.constructs.archives.vector.tables.query_embedding_cache.stack import (
+    CachedQueryEmbedding,
+    QueryEmbeddingCacheTable,
+)
 from omnilake.constructs.archives.vector.tables.vector_stores.stack import (
     VectorStoresTable,
     VectorStore,
@@ -80,6 +84,7 @@ class LakeConstructArchiveVectorStack(Stack):
                 IndexedEntriesTable,
                 LakeRawStorageManagerStack,
                 ProvisionedArchivesTable,
+                QueryEmbeddingCacheTable,
                 RegisteredRequestConstructsTable,
                 SourcesTable,
                 VectorStoresTable,
@@ -130,7 +135,7 @@ class LakeConstructArchiveVectorStack(Stack):
             index='provisioner.py',
             handler='handler',
             function_name=resource_namer('archive-vector-provisioner', scope=self),
-            memory_size=512,
+            memory_size=1024,
             resource_access_requests=[
                 ResourceAccessRequest(
                     resource_name=Archive.table_name,
@@ -163,7 +168,7 @@ class LakeConstructArchiveVectorStack(Stack):
             index='index.py',
             handler='handler',
             function_name=resource_namer('archive-vector-indexer', scope=self),
-            memory_size=512,
+            memory_size=1024,
             managed_policies=[
                 ManagedPolicy.from_managed_policy_arn(
                     scope=self,
@@ -172,6 +177,10 @@ class LakeConstructArchiveVectorStack(Stack):
                 ),
             ],
             resource_access_requests=[
+                ResourceAccessRequest(
+                    resource_name='ai_statistics_collector',
+                    resource_type=ResourceType.REST_SERVICE,
+                ),
                 ResourceAccessRequest(
                     resource_name='event_bus',
                     resource_type=ResourceType.ASYNC_SERVICE,
@@ -212,7 +221,7 @@ class LakeConstructArchiveVectorStack(Stack):
                 )
             ],
             scope=self,
-            timeout=Duration.minutes(2),
+            timeout=Duration.minutes(4),
         )
 
         self.vector_store_bucket.grant_read_write(self.entry_index.handler.function)
@@ -263,6 +272,11 @@ class LakeConstructArchiveVectorStack(Stack):
                     resource_type=ResourceType.TABLE,
                     policy_name='read',
                 ),
+                ResourceAccessRequest(
+                    resource_name=CachedQueryEmbedding.table_name,
+                    resource_type=ResourceType.TABLE,
+                    policy_name='read_write',
+                ),
                 ResourceAccessRequest(
                     resource_name=Entry.table_name,
                     resource_type=ResourceType.TABLE,
@@ -328,6 +342,38 @@ class LakeConstructArchiveVectorStack(Stack):
 
         self.vector_store_bucket.grant_read_write(self.vacuum.handler.function)
 
+        # Compacts the vector store and builds its vector index, which reads every vector in the store, so it gets
+        # more memory and time than the per entry functions
+        self.maintenance = EventBusSubscriptionFunction(
+            base_image=self.app_base_image,
+            construct_id='vector_maintenance',
+            description='Compacts a vector store and maintains its vector index',
+            entry=self.runtime_path,
+            event_type='omnilake_archive_vector_maintenance_request',
+            index='maintenance.py',
+            handler='handler',
+            function_name=resource_namer('archive-vector-maintenance', scope=self),
+            memory_size=3008,
+            resource_access_requests=[
+                ResourceAccessRequest(
+                    resource_name=Job.table_name,
+                    resource_type=ResourceType.TABLE,
+                    policy_name='read_write',
+                ),
+                ResourceAccessRequest(
+                    resource_name=VectorStore.table_name,
+                    resource_type=ResourceType.TABLE,
+                    policy_name='read_write',
+                ),
+            ],
+            scope=self,
+            timeout=Duration.minutes(15),
+        )
+
+        self.vector_store_bucket.grant_read_write(self.maintenance.handler.function)
+
+        # Entries indexed through the indexer are tagged in place, this function handles tag generation
+        # events that are published directly
         self.entry_tag_generator_event = EventBusSubscriptionFunction(
             base_image=self.app_base_image,
             construct_id='entry_tag_generator',
@@ -0,0 +1,125 @@
+import base64
+import hashlib
+import zlib
+
+from datetime import datetime, timedelta, UTC as utc_tz
+from typing import List, Optional, Union
+
+import numpy as np
+
+from da_vinci.core.orm import (
+    TableClient,
+    TableObject,
+    TableObjectAttribute,
+    TableObjectAttributeType,
+)
+
+
+class CachedQueryEmbedding(TableObject):
+    table_name = "vector_archive_query_embedding_cache"
+
+    description = "Caches the embeddings of query strings so repeated queries do not require another embedding request"
+
+    partition_key_attribute = TableObjectAttribute(
+        name="cache_key",
+        attribute_type=TableObjectAttributeType.STRING,
+        description="The hash of the embedding model and the query string",
+    )
+
+    ttl_attribute = TableObjectAttribute(
+        name="time_to_live",
+        attribute_type=TableObjectAttributeType.DATETIME,
+        description="The date and time the cached embedding will expire.",
+        default=lambda: datetime.now(utc_tz) + timedelta(days=30),
+        optional=True,
+    )
+
+    attributes = [
+        TableObjectAttribute(
+            name="created_on",
+            attribute_type=TableObjectAttributeType.DATETIME,
+            description="The date and time the embedding was cached.",
+            default=lambda: datetime.now(utc_tz),
+        ),
+
+        TableObjectAttribute(
+            name="embedding",
+            attribute_type=TableObjectAttributeType.STRING,
+            description="The base64 encoded, zlib compressed float32 embedding",
+        ),
+    ]
+
+    def __init__(self, cache_key: str, embedding: str, created_on: Optional[datetime] = None,
+                 time_to_live: Optional[datetime] = None):
+        """
+        Initialize the CachedQueryEmbedding object.
+
+        Keyword arguments:
+        cache_key -- The hash of the embedding model and the query string
+        embedding -- The base64 encoded, zlib compressed float32 embedding
+        created_on -- The date and time the embedding was cached.
+        time_to_live -- The date and time the cached embedding will expire.
+        """
+        super().__init__(
+            cache_key=cache_key,
+            created_on=created_on,
+            embedding=embedding,
+            time_to_live=time_to_live,
+        )
+
+    @staticmethod
+    def encode_embedding(embedding: List[float]) -> str:
+        """
+        Encode an embedding for storage.
+
+        Keyword arguments:
+        embedding -- The embedding to encode
+        """
+        return base64.b64encode(zlib.compress(np.asarray(embedding, dtype=np.float32).tobytes())).decode('utf-8')
+
+    @staticmethod
+    def generate_cache_key(query: str, model_id: str) -> str:
+        """
+        Generate the cache key for the given query string. The model is part of the key so changing it
+        invalidates previously cached embeddings.
+
+        Keyword arguments:
+        query -- The query string that was embedded
+        model_id -- The model ID used to embed the query
+        """
+        query_hash = hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+        return f"{model_id}:{query_hash}"
+
+    def embedding_values(self) -> List[float]:
+        """
+        Decode the stored embedding.
+        """
+        return np.frombuffer(zlib.decompress(base64.b64decode(self.embedding)), dtype=np.float32).tolist()
+
+
+class QueryEmbeddingCacheClient(TableClient):
+    def __init__(self, app_name: Optional[str] = None, deployment_id: Optional[str] = None):
+        super().__init__(
+            app_name=app_name,
+            default_object_class=CachedQueryEmbedding,
+            deployment_id=deployment_id,
+        )
+
+    def get(self, cache_key: str) -> Union[CachedQueryEmbedding, None]:
+        """
+        Get the cached embedding for a cache key
+
+        Keyword arguments:
+        cache_key -- The cache key
+        """
+        return self.get_object(partition_key_value=cache_key)
+
+    def put(self, cached_embedding: CachedQueryEmbedding) -> None:
+        """
+        Put a cached embedding
+
+        Keyword arguments:
+        cached_embedding -- The cached embedding to put
+        """
+        return self.put_object(table_object=cached_embedding)
@@ -1,5 +1,5 @@
 from datetime import datetime, UTC as utc_tz
-from typing import List, Optional, Union
+from typing import Iterable, List, Optional, Union
 
 from da_vinci.core.orm import (
     TableClient,
@@ -9,6 +9,8 @@ from da_vinci.core.orm import (
     TableScanDefinition,
 )
 
+from omnilake.internal_lib.batch_operations import batch_write_items
+
 
 class VectorStoreChunk(TableObject):
     table_name = "vector_store_chunks"
@@ -62,6 +64,34 @@ class VectorStoreChunksClient(TableClient):
             deployment_id=deployment_id
         )
 
+    def batch_delete(self, chunks: Iterable[VectorStoreChunk]) -> None:
+        """
+        Delete multiple chunks using batched writes
+
+        Keyword Arguments:
+        chunks -- The chunks to delete
+        """
+        batch_write_items(self, [
+            {
+                'DeleteRequest': {
+                    'Key': self.default_object_class.gen_dynamodb_key(
+                        partition_key_value=chunk.archive_id,
+                        sort_key_value=chunk.chunk_id,
+                    ),
+                },
+            }
+            for chunk in chunks
+        ])
+
+    def batch_put(self, chunks: Iterable[VectorStoreChunk]) -> None:
+        """
+        Put multiple chunks using batched writes
+
+        Keyword Arguments:
+        chunks -- The chunks to put
+        """
+        batch_write_items(self, [{'PutRequest': {'Item': chunk.to_dynamodb_item()}} for chunk in chunks])
+
     def delete(self, chunk: VectorStoreChunk) -> None:
         """
         Delete a chunk of an entry stored in the vector store
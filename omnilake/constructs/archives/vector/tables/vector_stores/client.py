@@ -1,5 +1,5 @@
 from datetime import datetime, UTC as utc_tz
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 from uuid import uuid4
 
 from da_vinci.core.orm import (
@@ -36,6 +36,13 @@ class VectorStore(TableObject):
             default=lambda: datetime.now(utc_tz),
         ),
 
+        TableObjectAttribute(
+            name='indexed_chunks',
+            attribute_type=TableObjectAttributeType.NUMBER,
+            description='The number of chunks in the vector store when its vector index was last built.',
+            optional=True,
+        ),
+
         TableObjectAttribute(
             name='total_entries',
             attribute_type=TableObjectAttributeType.NUMBER,
@@ -53,13 +60,12 @@ class VectorStore(TableObject):
         TableObjectAttribute(
             name='vector_store_id',
             attribute_type=TableObjectAttributeType.STRING,
-            description='The unique id of the vector store',
-            default=lambda: str(uuid4())
+            description='The unique id of the vector store, generated on construction when not given',
         ),
     ]
 
     def __init__(self, archive_id: str, bucket_name: str, created_on: Optional[datetime] = None,
-                 total_entries: Optional[int] = 0, total_entries_last_calculated: Optional[datetime] = None,
+                 indexed_chunks: Optional[int] = None, total_entries: Optional[int] = 0, total_entries_last_calculated: Optional[datetime] = None,
                  vector_store_id: Optional[str] = None):
         """
         Initialize a new vector store object.
@@ -68,14 +74,27 @@ class VectorStore(TableObject):
         archive_id -- The unique identifier for the archive the vector store belongs to.
         bucket_name -- The S3 bucket name where the vector store content is stored.
         created_on -- The date and time the vector store was created.
+        indexed_chunks -- The number of chunks in the vector store when its vector index was last built.
         total_entries -- The total number of entries in the vector store.
         total_entries_last_calculated -- The date and time the total entries was last calculated.
         vector_store_id -- The unique name of the vector store.
         """
+        # A new vector store takes a single timestamp for both dates instead of one per attribute default
+        if created_on is None or total_entries_last_calculated is None:
+            now = datetime.now(utc_tz)
+
+            created_on = created_on or now
+
+            total_entries_last_calculated = total_entries_last_calculated or now
+
+        # Only generated when the caller did not provide the ID, such as when the vector store is first provisioned
+        vector_store_id = vector_store_id or str(uuid4())
+
         super().__init__(
             archive_id=archive_id,
             bucket_name=bucket_name,
             created_on=created_on,
+            indexed_chunks=indexed_chunks,
             total_entries=total_entries,
             total_entries_last_calculated=total_entries_last_calculated,
             vector_store_id=vector_store_id,
@@ -88,6 +107,10 @@ class VectorStoresScanDefinition(TableScanDefinition):
 
 
 class VectorStoresClient(TableClient):
+    # Vector store IDs resolved by get_vector_store_id, shared across clients in the execution environment.
+    # An archive keeps the same vector store once provisioned so entries don't expire.
+    _vector_store_id_cache: Dict[str, str] = {}
+
     def __init__(self, app_name: Optional[str] = None, deployment_id: Optional[str] = None):
         super().__init__(
             app_name=app_name,
@@ -108,6 +131,8 @@ class VectorStoresClient(TableClient):
         Keyword Arguments:
         vector_store -- The vector store object to delete.
         """
+        self._vector_store_id_cache.pop(vector_store.archive_id, None)
+
         self.delete_object(vector_store)
 
     def get(self, archive_id: str) -> Union[VectorStore, None]:
@@ -119,6 +144,73 @@ class VectorStoresClient(TableClient):
         """
         return self.get_object(partition_key_value=archive_id)
 
+    def get_vector_store_id(self, archive_id: str) -> Union[str, None]:
+        """
+        Get the ID of the vector store belonging to an archive, only reading the table the first time
+        the archive is seen in the execution environment.
+
+        Keyword Arguments:
+        archive_id -- The unique identifier for the archive the vector store belongs to.
+        """
+        if archive_id not in self._vector_store_id_cache:
+            vector_store = self.get(archive_id=archive_id)
+
+            if not vector_store:
+                return None
+
+            self._vector_store_id_cache[archive_id] = vector_store.vector_store_id
+
+        return self._vector_store_id_cache[archive_id]
+
+    def increment_total_entries(self, archive_id: str, amount: int = 1) -> int:
+        """
+        Atomically add to the total number of entries of a vector store, avoiding a read-modify-write
+        that would lose updates from concurrent writers. Returns the updated total.
+
+        Keyword Arguments:
+        archive_id -- The unique identifier for the archive the vector store belongs to.
+        amount -- The amount to add, negative to subtract.
+        """
+        # Serialized through the object so the timestamp is stored in the same format as a regular put
+        last_calculated = VectorStore(
+            archive_id=archive_id,
+            bucket_name='',
+            total_entries_last_calculated=datetime.now(utc_tz),
+        ).to_dynamodb_item()['TotalEntriesLastCalculated']
+
+        response = self.client.update_item(
+            TableName=self.table_endpoint_name,
+            Key=self.default_object_class.gen_dynamodb_key(partition_key_value=archive_id),
+            UpdateExpression='ADD TotalEntries :amount SET TotalEntriesLastCalculated = :last_calculated',
+            ConditionExpression='attribute_exists(ArchiveId)',
+            ExpressionAttributeValues={
+                ':amount': {'N': str(amount)},
+                ':last_calculated': last_calculated,
+            },
+            ReturnValues='UPDATED_NEW',
+        )
+
+        return int(response['Attributes']['TotalEntries']['N'])
+
+    def set_indexed_chunks(self, archive_id: str, indexed_chunks: int) -> None:
+        """
+        Record the number of chunks the vector index of a vector store was built over, without overwriting
+        the counters maintained by concurrent writers.
+
+        Keyword Arguments:
+        archive_id -- The unique identifier for the archive the vector store belongs to.
+        indexed_chunks -- The number of chunks the vector index was built over.
+        """
+        self.client.update_item(
+            TableName=self.table_endpoint_name,
+            Key=self.default_object_class.gen_dynamodb_key(partition_key_value=archive_id),
+            UpdateExpression='SET IndexedChunks = :indexed_chunks',
+            ConditionExpression='attribute_exists(ArchiveId)',
+            ExpressionAttributeValues={
+                ':indexed_chunks': {'N': str(indexed_chunks)},
+            },
+        )
+
     def put(self, vector_store: VectorStore) -> None:
         """
         Put a vector store into the table.
@@ -126,4 +218,6 @@ class VectorStoresClient(TableClient):
         Keyword Arguments:
         vector_store -- The vector store to put into the table.
         """
+        self._vector_store_id_cache.pop(vector_store.archive_id, None)
+
         return self.put_object(vector_store)
\ No newline at end of file
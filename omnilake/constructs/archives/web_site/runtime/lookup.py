@@ -2,17 +2,19 @@
 Handles the lookup of data in a Web Site archive.
 """
 import logging
+import random
+import socket
 
 import aiohttp
 import asyncio
 
 from datetime import datetime, UTC as utc_tz
-from urllib.parse import urljoin
-from typing import Dict, List
+from urllib.parse import urljoin, urlparse, urlsplit
+from typing import Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
-from markdownify import markdownify as md
+from markdownify import MarkdownConverter
 
 from da_vinci.core.immutable_object import ObjectBody
 from da_vinci.core.logging import Logger
@@ -33,6 +35,13 @@ from omnilake.tables.provisioned_archives.client import ArchivesClient
 from omnilake.tables.jobs.client import JobsClient
 
 
+_ARCHIVES_CLIENT = ArchivesClient()
+
+_JOBS_CLIENT = JobsClient()
+
+_EVENT_PUBLISHER = EventPublisher()
+
+
 REQUEST_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:98.0) Gecko/20100101 Firefox/98.0",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
@@ -48,52 +57,265 @@ REQUEST_HEADERS = {
 }
 
 
+_BODY_STRAINER = SoupStrainer('body')
+
+# The converter only holds its options, so a single instance is shared by every page conversion
+_MARKDOWN_CONVERTER = MarkdownConverter()
+
+# Maximum number of URLs fetched at the same time
+_MAX_CONCURRENT_FETCHES = 16
+
+# Maximum number of URLs fetched from the same host at the same time
+_MAX_CONCURRENT_FETCHES_PER_HOST = 8
+
+# Page fetches are retried on these statuses and on connection errors
+_RETRYABLE_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+_MAX_FETCH_ATTEMPTS = 4
+
+# The longest a retry waits, even if the site asks for more with Retry-After
+_MAX_RETRY_DELAY_SECONDS = 10
+
+# Pages larger than this are not loaded, keeps the memory used by a lookup bounded regardless of the site
+_MAX_PAGE_BYTES = 8 * 1024 * 1024
+
+_PAGE_READ_CHUNK_BYTES = 64 * 1024
+
+# Maximum number of entries created with a single raw storage request, keeps the request payload bounded
+_MAX_ENTRIES_PER_CREATE_REQUEST = 25
+
+
+def _build_urls(base_url: str, paths: List[str]) -> List[str]:
+    """
+    Returns the URL of each path, resolved against the base URL the same way urljoin does. Plain relative
+    paths under a base URL ending with a slash are appended directly, everything else goes through urljoin.
+
+    Keyword Arguments:
+        base_url: The base URL of the archive
+        paths: The paths to build URLs for
+    """
+    # Query strings and fragments on the base are dropped by urljoin, so only a clean directory base can be appended to
+    base_parts = urlsplit(base_url)
+
+    can_append = base_url.endswith('/') and not base_parts.query and not base_parts.fragment
+
+    urls = []
+
+    for path in paths:
+        if can_append and path and not path.startswith(('/', '.', '?', '#')) and ':' not in path \
+                and '/.' not in path:
+            urls.append(base_url + path)
+
+        else:
+            urls.append(urljoin(base_url, path))
+
+    return urls
+
+
+def _html_to_markdown(html: bytes, encoding: Optional[str] = None) -> Optional[str]:
+    """
+    Converts the body of an HTML page to markdown, leaving out any style and script content.
+
+    Keyword Arguments:
+        html: The raw HTML page
+        encoding: The character set the page declared in its response headers, detected when not given
+    """
+    # Only the body is built into a tree, the head is tokenized and dropped
+    soup = BeautifulSoup(html, 'html.parser', parse_only=_BODY_STRAINER, from_encoding=encoding)
+
+    for data in soup(['style', 'script']):
+        # Remove tags
+        data.decompose()
+
+    body = soup.find('body')
+
+    if not body:
+        return None
+
+    # The already parsed body is converted directly rather than serialized back to HTML for markdownify to re-parse
+    return _MARKDOWN_CONVERTER.convert_soup(body)
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Returns how long to wait before retrying a page fetch, honoring the Retry-After header when it is
+    given in seconds and backing off exponentially with jitter otherwise.
+
+    Keyword Arguments:
+        attempt: The number of the attempt that failed, starting at 0
+        retry_after: The Retry-After header of the failed response
+    """
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), _MAX_RETRY_DELAY_SECONDS)
+
+    return min(0.5 * (2 ** attempt) + random.random(), _MAX_RETRY_DELAY_SECONDS)
+
+
+async def _read_page(response: aiohttp.ClientResponse, url: str) -> bytes:
+    """
+    Reads the raw page from the response, raising a ValueError as soon as it exceeds the page size limit.
+
+    Keyword Arguments:
+        response: The response to read the page from
+        url: The URL the page was requested from
+    """
+    if response.content_length and response.content_length > _MAX_PAGE_BYTES:
+        raise ValueError(f"Page at {url} is {response.content_length} bytes, over the {_MAX_PAGE_BYTES} byte limit")
+
+    page = bytearray()
+
+    async for chunk in response.content.iter_chunked(_PAGE_READ_CHUNK_BYTES):
+        page.extend(chunk)
+
+        if len(page) > _MAX_PAGE_BYTES:
+            raise ValueError(f"Page at {url} is over the {_MAX_PAGE_BYTES} byte limit")
+
+    return bytes(page)
+
+
+async def _get_with_retry(session: aiohttp.ClientSession, host_semaphore: asyncio.Semaphore,
+                          url: str) -> Tuple[int, Optional[bytes], Optional[str]]:
+    """
+    Fetches a page, retrying throttled, failed and timed out requests. Returns the final status along with the raw
+    page and its declared character set when the fetch succeeded.
+
+    Keyword Arguments:
+        session: The session the request is made with
+        host_semaphore: Bounds the number of requests made to the URL's host at the same time
+        url: The URL to fetch
+    """
+    for attempt in range(_MAX_FETCH_ATTEMPTS):
+        is_last_attempt = attempt == _MAX_FETCH_ATTEMPTS - 1
+
+        retry_after = None
+
+        try:
+            async with host_semaphore:
+                async with session.get(url=url) as response:
+                    if response.status == 200:
+                        # The raw bytes are decoded once by the parser instead of first being decoded into a string.
+                        # An oversized page is not retried, it fails the URL
+                        return response.status, await _read_page(response, url), response.charset
+
+                    if response.status not in _RETRYABLE_STATUSES or is_last_attempt:
+                        return response.status, None, None
+
+                    retry_after = response.headers.get('Retry-After')
+
+                    logging.debug(f"Retrying {url} after status {response.status}")
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if is_last_attempt:
+                raise
+
+            logging.debug(f"Retrying {url} after error: {e}")
+
+        # Sleeping outside of the host semaphore lets other requests to the host go ahead in the meantime
+        await asyncio.sleep(_retry_delay(attempt, retry_after))
+
+
+async def _fetch_one(session: aiohttp.ClientSession, semaphore: asyncio.BoundedSemaphore,
+                     host_semaphores: Dict[str, asyncio.Semaphore], url: str) -> Optional[Tuple[str, str]]:
+    """
+    Loads the web content of a single URL and returns the markdown content and URL of the entry to create
+    for it, None if the page could not be retrieved or formatted.
+
+    Keyword Arguments:
+        session: The session the request is made with
+        semaphore: Bounds the number of URLs fetched at the same time
+        host_semaphores: Bound the number of URLs fetched from each host at the same time, keyed by host
+        url: The URL to load
+    """
+    host = urlparse(url).netloc
+
+    if host not in host_semaphores:
+        host_semaphores[host] = asyncio.Semaphore(_MAX_CONCURRENT_FETCHES_PER_HOST)
+
+    async with semaphore:
+        status, html, encoding = await _get_with_retry(session, host_semaphores[host], url)
+
+        if status != 200:
+            logging.warning(f"Failed to retrieve {url}: {status}")
+
+            return None
+
+        # Parsing is CPU bound, running it off the event loop lets the other fetches keep reading
+        formatted_body = await asyncio.get_running_loop().run_in_executor(None, _html_to_markdown, html, encoding)
+
+        if not formatted_body:
+            logging.warning(f"Failed to format {url}")
+
+            return None
+
+        return formatted_body, url
+
+
 async def load_web_content(urls: List[str]) -> List[str]:
     """
-    Asynchronously loads the web content from a list of URLs and return the resulting list of entry ids.
+    Asynchronously loads the web content from a list of URLs and return the resulting list of entry ids,
+    in the same order as the URLs they were loaded from.
 
     Keyword Arguments:
         urls: A list of URLs to load
     """
-    raw_storage = RawStorageManager()
+    # Every entry is effective as of when the lookup ran, not when its page happened to arrive
+    effective_on = datetime.now(tz=utc_tz)
 
-    loaded_content = []
+    semaphore = asyncio.BoundedSemaphore(_MAX_CONCURRENT_FETCHES)
 
-    for url in urls:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url=url, headers=REQUEST_HEADERS) as response:
-                if response.status != 200:
-                    logging.warning(f"Failed to retrieve {url}: {response.status}")
+    # Created per call, asyncio primitives are bound to the event loop of the lookup that first uses them
+    host_semaphores = {}
 
-                    continue
+    # A single session pools the connections, DNS lookups and TLS sessions across all of the URLs. Resolution is
+    # limited to IPv4, Lambda has no IPv6 egress so AAAA records only lead to failed connection attempts
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=32, family=socket.AF_INET, ttl_dns_cache=300,
+                                     keepalive_timeout=30)
 
-                html = await response.text()
+    async with aiohttp.ClientSession(connector=connector, headers=REQUEST_HEADERS,
+                                     timeout=aiohttp.ClientTimeout(total=30)) as session:
+        results = await asyncio.gather(
+            *[_fetch_one(session, semaphore, host_semaphores, url) for url in urls],
+            return_exceptions=True,
+        )
 
-                soup = BeautifulSoup(html, 'html.parser')
+    pages = []
 
-                for data in soup(['style', 'script']):
-                    # Remove tags
-                    data.decompose()
+    for url, result in zip(urls, results):
+        if isinstance(result, BaseException):
+            logging.warning(f"Failed to load {url}: {result}")
 
-                body = soup.find('body')
+            continue
 
-                formatted_body = md(html=str(body))
+        if result:
+            pages.append(result)
 
-                if not formatted_body:
-                    logging.warning(f"Failed to format {url}")
+    raw_storage = RawStorageManager()
 
-                    continue
+    loaded_content = []
 
-                resp = raw_storage.create_entry_with_source(
-                    content=formatted_body,
-                    effective_on=datetime.now(tz=utc_tz),
-                    source_type="web_page_content",
-                    source_arguments={"url": url},
-                )
+    # Entries are created with one raw storage request per batch instead of one per page
+    for batch_start in range(0, len(pages), _MAX_ENTRIES_PER_CREATE_REQUEST):
+        batch = pages[batch_start:batch_start + _MAX_ENTRIES_PER_CREATE_REQUEST]
+
+        resp = raw_storage.create_entries_with_source(
+            entries=[
+                {
+                    "content": formatted_body,
+                    "source_type": "web_page_content",
+                    "source_arguments": {"url": url},
+                }
+                for formatted_body, url in batch
+            ],
+            effective_on=effective_on,
+        )
+
+        for (_, url), created in zip(batch, resp.response_body["entries"]):
+            if "entry_id" not in created:
+                logging.warning(f"Failed to create entry for {url}: {created.get('message')}")
 
-                entry_id = resp.response_body["entry_id"]
+                continue
 
-                loaded_content.append(entry_id)
+            loaded_content.append(created["entry_id"])
 
     return loaded_content
 
@@ -121,22 +343,22 @@ def handler(event: Dict, context: Dict):
 
     parent_job_type = event_body["parent_job_type"]
 
-    jobs_client = JobsClient()
-
-    parent_job = jobs_client.get(job_type=parent_job_type, job_id=parent_job_id, consistent_read=True)
+    # The parent job is only read to create the child job, so an eventually consistent read is enough. A strongly
+    # consistent read is only made when the job was written too recently to be returned yet
+    parent_job = _JOBS_CLIENT.get(job_type=parent_job_type, job_id=parent_job_id) \
+        or _JOBS_CLIENT.get(job_type=parent_job_type, job_id=parent_job_id, consistent_read=True)
 
     child_job = parent_job.create_child(job_type="ARCHIVE_WEB_SITE_LOOKUP")
 
     # Execute the entry lookup under the child job
-    with jobs_client.job_execution(child_job):
+    with _JOBS_CLIENT.job_execution(child_job):
         retrieval_instructions = event_body.get("request_body")
 
         archive_id = retrieval_instructions.get("archive_id")
 
-        # Load the archive from the table to retrieve the base URL
-        archives_client = ArchivesClient()
-
-        archive = archives_client.get(archive_id=archive_id)
+        # Load the archive from the table to retrieve the base URL, the base URL rarely changes so a recently
+        # retrieved archive is reused
+        archive = _ARCHIVES_CLIENT.get(archive_id=archive_id, use_cache=True)
 
         if not archive:
             raise Exception(f"Archive {archive_id} not found")
@@ -144,8 +366,8 @@ def handler(event: Dict, context: Dict):
         # Grab the paths from the lookup config
         retrieve_paths = retrieval_instructions["retrieve_paths"]
 
-        # Generate URLs using URL Join
-        urls = [str(urljoin(archive.configuration["base_url"], path)) for path in retrieve_paths]
+        # Paths that resolve to the same URL are only fetched and stored once, the first occurrence keeps its place
+        urls = list(dict.fromkeys(_build_urls(archive.configuration["base_url"], retrieve_paths)))
 
         retrieved_entries = asyncio.run(load_web_content(urls))
 
@@ -159,9 +381,7 @@ def handler(event: Dict, context: Dict):
             schema=LakeRequestLookupResponse,
         )
 
-        event_publisher = EventPublisher()
-
-        event_publisher.submit(
+        _EVENT_PUBLISHER.submit(
             event=EventBusEvent(
                 body=response_obj.to_dict(ignore_unkown=True),
                 event_type=response_obj.get("event_type", strict=True),
@@ -11,6 +11,8 @@ from typing import Dict, List
 
 import requests
 
+from requests.adapters import HTTPAdapter
+
 from da_vinci.core.immutable_object import ObjectBody
 from da_vinci.core.logging import Logger
 
@@ -29,12 +31,23 @@ from omnilake.tables.source_types.client import SourceType, SourceTypesClient
 from omnilake.constructs.archives.web_site.runtime.lookup import REQUEST_HEADERS
 
 
+# The session is created once per execution environment so warm invocations reuse its connections
+_HTTP = requests.Session()
+
+_HTTP.headers.update(REQUEST_HEADERS)
+
+_HTTP.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Seconds to wait on the test path before treating the web site as unreachable
+_TEST_PATH_TIMEOUT = 10
+
+
 def _check_test_path(url: str) -> bool:
     """
     Checks if the url is a test path
     """
     try:
-        response = requests.get(url=url, headers=REQUEST_HEADERS)
+        response = _HTTP.get(url=url, timeout=_TEST_PATH_TIMEOUT)
 
         logging.debug(f"Test Path Response satus: {response.status_code}")
 
@@ -30,6 +30,7 @@ from omnilake.tables.lake_chain_requests.client import (
 )
 
 from omnilake.constructs.processors.inception.tables.chain_inception_runs.client import (
+    ChainInceptionRun,
     InceptionExecutionStatus,
     ChainInceptionRunClient,
 )
@@ -45,9 +46,26 @@ from omnilake.constructs.processors.inception.runtime.manager import (
 )
 
 
-def check_processor_complete(lake_request: LakeRequest):
+_CHAIN_INCEPTION_RUNS_CLIENT = ChainInceptionRunClient()
+
+_INCEPTION_MUTEX_CLIENT = InceptionMutexClient()
+
+_JOBS_CLIENT = JobsClient()
+
+_LAKE_CHAIN_REQUESTS_CLIENT = LakeChainRequestsClient()
+
+_LAKE_REQUESTS_CLIENT = LakeRequestsClient()
+
+_EVENT_PUBLISHER = EventPublisher()
+
+
+def check_processor_complete(lake_request: LakeRequest, inception_runs: List[ChainInceptionRun]) -> bool:
     """
     Checks if the processor is complete by checking the lake request table
+
+    Keyword arguments:
+    lake_request -- The lake request that is being processed
+    inception_runs -- The chain inception runs of the lake request
     """
     original_processing_instructions = lake_request.processing_instructions
 
@@ -59,74 +77,65 @@ def check_processor_complete(lake_request: LakeRequest):
         return True
 
     # distribution_mode is "INDIVIDUAL"
-    chain_inception_runs = ChainInceptionRunClient()
-
-    all_runs = chain_inception_runs.all_by_lake_request_id(lake_request_id=lake_request.lake_request_id)
-
-    all_run_chain_ids = [run.chain_request_id for run in all_runs]
+    all_run_chain_ids = [run.chain_request_id for run in inception_runs]
 
     completed_statuses = [InceptionExecutionStatus.COMPLETED, InceptionExecutionStatus.FAILED]
 
-    all_completed_runs = [run.chain_request_id for run in all_runs if run.execution_status in completed_statuses]
+    all_completed_runs = [run.chain_request_id for run in inception_runs if run.execution_status in completed_statuses]
 
     return len(all_run_chain_ids) == len(all_completed_runs)
 
 
-def _identify_responding_request_id(chain_definition: List[Dict], chain_id: str) -> str:
+def _export_response_name(chain_definition: List[Dict]) -> str:
     """
-    Identifies the responding request id based on the processing instructions and the chain id
+    Identifies the name of the request that exports the response of the chain
 
     Keyword arguments:
     chain_definition -- The chain definition that is being processed
-    chain_id -- The chain id that is being processed
     """
-    lake_request_name = None
-
     for lake_request in chain_definition:
         if lake_request["lake_request"]["response_config"]["response_type"] == "EXPORT_RESPONSE":
-            lake_request_name = lake_request["name"]
-
-            break
-
-    if not lake_request_name:
-        raise ValueError("No lake request found with 'EXPORT_RESPONSE' responder type")
-
-    lake_chain_requests = LakeChainRequestsClient()
-
-    chain = lake_chain_requests.get(chain_request_id=chain_id)
+            return lake_request["name"]
 
-    return chain.executed_requests[lake_request_name]
+    raise ValueError("No lake request found with 'EXPORT_RESPONSE' responder type")
 
 
-def get_response_entry_ids(lake_request: LakeRequest) -> List[str]:
+def get_response_entry_ids(lake_request: LakeRequest, inception_runs: List[ChainInceptionRun]) -> List[str]:
     """
     Gets the entry ids that are expected to be returned by this chain
 
     Keyword arguments:
     lake_request -- The lake request that is being processed
-    chain_id -- The chain id that is being processed
+    inception_runs -- The chain inception runs of the lake request
     """
     original_processing_instructions = lake_request.processing_instructions
 
-    lake_requests = LakeRequestsClient()
+    all_run_chain_ids = [run.chain_request_id for run in inception_runs]
 
-    response_entry_ids = []
-
-    chain_inception_runs = ChainInceptionRunClient()
+    # The chains and their responding requests are each retrieved with batched reads instead of one read per chain
+    chains = _LAKE_CHAIN_REQUESTS_CLIENT.batch_get(chain_request_ids=all_run_chain_ids)
 
-    all_runs = chain_inception_runs.all_by_lake_request_id(lake_request_id=lake_request.lake_request_id)
+    # Every chain runs the same definition, so the responding request has the same name in each of them
+    export_name = _export_response_name(chain_definition=original_processing_instructions["chain_definition"])
 
-    all_run_chain_ids = [run.chain_request_id for run in all_runs]
+    responding_request_ids = []
 
     for chain_id in all_run_chain_ids:
-        responding_request_id = _identify_responding_request_id(
-            chain_definition=original_processing_instructions["chain_definition"],
-            chain_id=chain_id,
-        )
+        chain = chains.get(chain_id)
+
+        if not chain:
+            raise ValueError(f"Lake chain request not found for chain request id {chain_id}")
+
+        responding_request_ids.append(chain.executed_requests[export_name])
+
+    responding_lake_requests = _LAKE_REQUESTS_CLIENT.batch_get(lake_request_ids=responding_request_ids, consistent_read=True)
+
+    response_entry_ids = []
 
-        responding_lake_request = lake_requests.get(lake_request_id=responding_request_id, consistent_read=True)
+    for responding_request_id in responding_request_ids:
+        responding_lake_request = responding_lake_requests.get(responding_request_id)
 
-        response_entry = responding_lake_request.response_entry_id
+        response_entry = responding_lake_request.response_entry_id if responding_lake_request else None
 
         if not response_entry:
             raise ValueError(f"Response entry id not found for lake request {responding_request_id}")
@@ -136,15 +145,17 @@ def get_response_entry_ids(lake_request: LakeRequest) -> List[str]:
     return response_entry_ids
 
 
-def submit_join_request(originating_lake_request_id: str, entry_ids: List[str], join_instructions: Dict, lock_id: str):
+def submit_join_request(originating_lake_request_id: str, entry_ids: List[str], join_instructions: Dict, lock_id: str,
+                        inception_runs: List[ChainInceptionRun]):
     """
     Submits a join request to join the results of the chains together
 
     Keyword arguments:
     originating_lake_request_id -- The ID of the originating lake request
-    lake_request -- The lake request that is being processed
     entry_ids -- The entry ids that are being joined
     join_instructions -- The instructions for joining the entries
+    lock_id -- The lock ID held for submitting the join request
+    inception_runs -- The chain inception runs of the originating lake request
     """
     chain = [
         {
@@ -166,12 +177,12 @@ def submit_join_request(originating_lake_request_id: str, entry_ids: List[str],
 
     logging.debug(f"Constructed final joiner chain: {chain}")
 
-    chain_manager = ChainRequestManager(jobs_client=JobsClient())
+    chain_manager = ChainRequestManager(jobs_client=_JOBS_CLIENT)
 
     chain_manager.submit_chain_request(
         lake_request_id=originating_lake_request_id,
         callback_event_type='omnilake_processor_inception_join_completion',
-        parent_job=get_inception_job(lake_request_id=originating_lake_request_id),
+        parent_job=get_inception_job(lake_request_id=originating_lake_request_id, inception_runs=inception_runs),
         request=chain,
         validate_lock_id=lock_id,
     )
@@ -200,23 +211,19 @@ def handler(event: Dict, context: Dict):
     response_status = event_body["response_status"]
 
     # Get the corresponding Lake Request
-    chain_inception_runs = ChainInceptionRunClient()
-
-    chain_inception_run = chain_inception_runs.get_by_chain_request_id(chain_request_id=chain_request_id)
+    chain_inception_run = _CHAIN_INCEPTION_RUNS_CLIENT.get_by_chain_request_id(chain_request_id=chain_request_id)
 
     if not chain_inception_run:
         raise ValueError(f"Chain Inception Run not found for chain request id {chain_request_id}")
 
-    lake_requests = LakeRequestsClient()
-
-    lake_request = lake_requests.get(lake_request_id=chain_inception_run.lake_request_id)
+    lake_request = _LAKE_REQUESTS_CLIENT.get(lake_request_id=chain_inception_run.lake_request_id)
 
     if not lake_request:
         raise ValueError(f"Lake Request not found for lake request id {chain_inception_run.lake_request_id}")
 
     chain_inception_run.execution_status = response_status
 
-    chain_inception_runs.put(chain_inception_run)
+    _CHAIN_INCEPTION_RUNS_CLIENT.put(chain_inception_run)
 
     # If the Lake request was already failed due to another failure, then we don't need to do anything
     if lake_request.request_status == JobStatus.FAILED:
@@ -224,8 +231,6 @@ def handler(event: Dict, context: Dict):
 
         return
 
-    event_bus = EventPublisher()
-
     # COMPLETED or FAILED
     if response_status == "FAILED":
         processor_job = get_inception_job(lake_request_id=lake_request.lake_request_id)
@@ -243,9 +248,7 @@ def handler(event: Dict, context: Dict):
 
         processor_job.status_message = failure_message
 
-        omni_jobs = JobsClient()
-
-        omni_jobs.put(processor_job)
+        _JOBS_CLIENT.put(processor_job)
 
         failure_event_body = ObjectBody(
             body={
@@ -259,9 +262,7 @@ def handler(event: Dict, context: Dict):
         )
 
         # Send Event failure to the lake
-        publisher = EventPublisher()
-
-        publisher.submit(
+        _EVENT_PUBLISHER.submit(
             event=source_event.next_event(
                 body=failure_event_body.to_dict(),
                 event_type=CALLBACK_ON_FAILURE_EVENT_TYPE,
@@ -270,10 +271,13 @@ def handler(event: Dict, context: Dict):
 
         return
 
-    if check_processor_complete(lake_request=lake_request):
+    # Queried once and shared by the completion check, the response collection and the join submission
+    inception_runs = _CHAIN_INCEPTION_RUNS_CLIENT.all_by_lake_request_id(lake_request_id=lake_request.lake_request_id)
+
+    if check_processor_complete(lake_request=lake_request, inception_runs=inception_runs):
         # If completed and it was more than one chain, then construct and launch the next chain
         # to join the results from each chain together
-        resulting_entry_ids = get_response_entry_ids(lake_request=lake_request)
+        resulting_entry_ids = get_response_entry_ids(lake_request=lake_request, inception_runs=inception_runs)
 
         if len(resulting_entry_ids) == 1:
             # Respond back to the lake request with the entry id
@@ -285,7 +289,7 @@ def handler(event: Dict, context: Dict):
                 schema=LakeRequestInternalResponseEventBodySchema,
             )
 
-            event_bus.submit(
+            _EVENT_PUBLISHER.submit(
                 event=source_event.next_event(
                     body=final_body.to_dict(),
                     event_type=final_body["event_type"],
@@ -297,9 +301,7 @@ def handler(event: Dict, context: Dict):
             return
 
         # Grab lock to prevent multiple join requests from being submitted
-        mutex_client = InceptionMutexClient()
-
-        lock_acquired = mutex_client.request_lock(lake_request_id=lake_request.lake_request_id)
+        lock_acquired = _INCEPTION_MUTEX_CLIENT.request_lock(lake_request_id=lake_request.lake_request_id)
 
         if not lock_acquired:
             logging.info(f"Another join request is already in progress for lake request {lake_request.lake_request_id}")
@@ -313,6 +315,7 @@ def handler(event: Dict, context: Dict):
             entry_ids=resulting_entry_ids,
             join_instructions=join_instructions,
             lock_id=lock_acquired,
+            inception_runs=inception_runs,
         )
 
         return
\ No newline at end of file
@@ -37,6 +37,17 @@ from omnilake.constructs.processors.inception.runtime.manager import (
 )
 
 
+_CHAIN_INCEPTION_RUNS_CLIENT = ChainInceptionRunClient()
+
+_JOBS_CLIENT = JobsClient()
+
+_LAKE_CHAIN_REQUESTS_CLIENT = LakeChainRequestsClient()
+
+_LAKE_REQUESTS_CLIENT = LakeRequestsClient()
+
+_EVENT_PUBLISHER = EventPublisher()
+
+
 _FN_NAME = "omnilake.constructs.processors.chain.join_completion"
 
 
@@ -59,20 +70,14 @@ def handler(event: Dict, context: Dict):
 
     response_status = event_body["response_status"]
 
-    event_bus = EventPublisher()
-
     # Get the corresponding Lake Request
-    chain_inception_runs = ChainInceptionRunClient()
-
-    chain_inception_run = chain_inception_runs.get_by_chain_request_id(chain_request_id=chain_request_id)
+    chain_inception_run = _CHAIN_INCEPTION_RUNS_CLIENT.get_by_chain_request_id(chain_request_id=chain_request_id)
 
     chain_inception_run.execution_status = response_status
 
-    chain_inception_runs.put(chain_inception_run)
-
-    chains = LakeChainRequestsClient()
+    _CHAIN_INCEPTION_RUNS_CLIENT.put(chain_inception_run)
 
-    chain_request = chains.get(chain_request_id=chain_request_id)
+    chain_request = _LAKE_CHAIN_REQUESTS_CLIENT.get(chain_request_id=chain_request_id)
 
     if not chain_request:
         raise ValueError(f"Chain Request not found for chain request id {chain_request_id}")
@@ -94,9 +99,7 @@ def handler(event: Dict, context: Dict):
 
         processor_job.status_message = failed_message
 
-        omni_jobs = JobsClient()
-
-        omni_jobs.put(processor_job)
+        _JOBS_CLIENT.put(processor_job)
 
         failure_event_body = ObjectBody(
             body={
@@ -110,7 +113,7 @@ def handler(event: Dict, context: Dict):
         )
 
         # Send Event failure to the lake
-        event_bus.submit(
+        _EVENT_PUBLISHER.submit(
             event=source_event.next_event(
                 body=failure_event_body.to_dict(),
                 event_type=CALLBACK_ON_FAILURE_EVENT_TYPE,
@@ -120,9 +123,7 @@ def handler(event: Dict, context: Dict):
         return
 
     # Find the entry
-    lake_requests = LakeRequestsClient()
-
-    response_lake_request = lake_requests.get(lake_request_id=chain_request.executed_requests['inception_joiner'])
+    response_lake_request = _LAKE_REQUESTS_CLIENT.get(lake_request_id=chain_request.executed_requests['inception_joiner'])
 
     final_body = ObjectBody(
         body={
@@ -132,7 +133,7 @@ def handler(event: Dict, context: Dict):
         schema=LakeRequestInternalResponseEventBodySchema,
     )
 
-    event_bus.submit(
+    _EVENT_PUBLISHER.submit(
         event=source_event.next_event(
             body=final_body.to_dict(),
             event_type=final_body["event_type"],
@@ -145,6 +146,4 @@ def handler(event: Dict, context: Dict):
 
     process_job.completed = datetime.now(tz=utc_tz)
 
-    omni_jobs = JobsClient()
-
-    omni_jobs.put(process_job)
\ No newline at end of file
+    _JOBS_CLIENT.put(process_job)
\ No newline at end of file
@@ -3,9 +3,10 @@ Library for managing the chain requests
 """
 import logging
 
-from copy import deepcopy
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 from uuid import uuid4
 
 from da_vinci.core.immutable_object import ObjectBody
@@ -34,6 +35,21 @@ from omnilake.constructs.processors.inception.tables.inception_mutex.client impo
 )
 
 
+_CHAIN_INCEPTION_RUNS_CLIENT = ChainInceptionRunClient()
+
+_INCEPTION_MUTEX_CLIENT = InceptionMutexClient()
+
+_JOBS_CLIENT = JobsClient()
+
+_LAKE_CHAIN_REQUESTS_CLIENT = LakeChainRequestsClient()
+
+_EVENT_PUBLISHER = EventPublisher()
+
+
+# Maximum number of buffered chain request events sent concurrently by ChainRequestManager.flush
+_MAX_CONCURRENT_EVENT_SUBMISSIONS = 16
+
+
 def lake_chain_failure_reason(chain_request_id: str) -> Union[str, None]:
     """
     Determines the reason for the lake chain failure
@@ -41,14 +57,10 @@ def lake_chain_failure_reason(chain_request_id: str) -> Union[str, None]:
     Keyword arguments:
     lake_chain_request -- The lake chain request object
     """
-    lake_chain_requests = LakeChainRequestsClient()
-
-    lake_chain_request = lake_chain_requests.get(chain_request_id=chain_request_id)
+    lake_chain_request = _LAKE_CHAIN_REQUESTS_CLIENT.get(chain_request_id=chain_request_id)
 
     # Grab the job from the chain 
-    omni_jobs = JobsClient()
-
-    job = omni_jobs.get(job_id=lake_chain_request.job_id, job_type=lake_chain_request.job_type)
+    job = _JOBS_CLIENT.get(job_id=lake_chain_request.job_id, job_type=lake_chain_request.job_type)
 
     if job.status == 'FAILED':
         return job.status_message
@@ -56,26 +68,24 @@ def lake_chain_failure_reason(chain_request_id: str) -> Union[str, None]:
     return None
 
 
-def get_inception_job(lake_request_id: str) -> Job:
+def get_inception_job(lake_request_id: str, inception_runs: Optional[List[ChainInceptionRun]] = None) -> Job:
     """
     Gets the inception job for the lake request
 
     Keyword arguments:
-    lake_request -- The lake request the executing processor belongs to
+    lake_request_id -- The ID of the lake request the executing processor belongs to
+    inception_runs -- The chain inception runs of the lake request, when the caller already retrieved them
     """
     # Get the job out of the chain inception run
-    inception_run_client = ChainInceptionRunClient()
+    if inception_runs is None:
+        inception_runs = _CHAIN_INCEPTION_RUNS_CLIENT.all_by_lake_request_id(lake_request_id=lake_request_id)
 
-    inception_run = inception_run_client.all_by_lake_request_id(lake_request_id=lake_request_id)
-
-    if not inception_run:
+    if not inception_runs:
         raise ValueError(f"Could not find any chain inception runs for lake request {lake_request_id}")
 
-    sampled_run = inception_run[0]
-
-    omni_jobs = JobsClient()
+    sampled_run = inception_runs[0]
 
-    return omni_jobs.get(job_id=sampled_run.job_id, job_type=sampled_run.job_type)
+    return _JOBS_CLIENT.get(job_id=sampled_run.job_id, job_type=sampled_run.job_type)
 
 
 @dataclass
@@ -92,6 +102,75 @@ class ReplacementDeclaration:
     min_declarations: int = None
 
 
+def _replace_stage(request: Dict, stage_name: str, replacement_value: Dict, lookup_idx: Optional[int] = None) -> Dict:
+    """
+    Returns a copy of the chain request with the stage, or a single lookup instruction of it, replaced. Only the
+    containers along the path to the replaced value are copied, the rest is shared with the given request.
+
+    Keyword arguments:
+    request -- The chain request to replace the stage in
+    stage_name -- The name of the lake request stage to replace
+    replacement_value -- The value to replace the stage or lookup instruction with
+    lookup_idx -- The index of the lookup instruction to replace, the whole stage is replaced when not given
+    """
+    if lookup_idx is not None:
+        lookup_instructions = list(request['lake_request'][stage_name])
+
+        lookup_instructions[lookup_idx] = replacement_value
+
+        replacement_value = lookup_instructions
+
+    return {**request, 'lake_request': {**request['lake_request'], stage_name: replacement_value}}
+
+
+def _type_name_key(stage_name: str) -> str:
+    """
+    Returns the key holding the type name of the given lake request stage
+
+    Keyword arguments:
+    stage_name -- The name of the lake request stage
+    """
+    if stage_name == 'lookup_instructions':
+        return 'request_type'
+
+    if stage_name == 'response_config':
+        return 'response_type'
+
+    return 'processor_type'
+
+
+def _declaration_index(chain_definition: List[Dict], stage_names: Set[str]) -> Dict[Tuple[str, str], List[Tuple[int, Optional[int]]]]:
+    """
+    Indexes the positions of the declarations in the chain definition by stage and type name. Each position is
+    the index of the request along with the index of the lookup instruction, None for the other stages.
+
+    Keyword arguments:
+    chain_definition -- List of dictionaries that define the chain
+    stage_names -- The names of the lake request stages to index
+    """
+    index = defaultdict(list)
+
+    for idx, request in enumerate(chain_definition):
+        request_config = request['lake_request']
+
+        for stage_name in stage_names:
+            stage = request_config.get(stage_name)
+
+            if not stage:
+                continue
+
+            type_name_key = _type_name_key(stage_name)
+
+            if stage_name == 'lookup_instructions':
+                for lookup_idx, lookup_instruction in enumerate(stage):
+                    index[(stage_name, lookup_instruction[type_name_key])].append((idx, lookup_idx))
+
+            else:
+                index[(stage_name, stage[type_name_key])].append((idx, None))
+
+    return index
+
+
 def pseudo_transpiler(chain_definition: List[Dict], replacements: List[ReplacementDeclaration]) -> Dict:
     """
     Replaces the pseudo parameters with the actual values
@@ -111,48 +190,43 @@ def pseudo_transpiler(chain_definition: List[Dict], replacements: List[Replaceme
 
     logging.debug(f"compiling chain_definition: {normalized_definition}")
 
-    new_chain_definition = deepcopy(normalized_definition)
+    # Requests are copied as they are replaced rather than deep copying the whole definition up front, the
+    # given definition is never modified
+    new_chain_definition = list(normalized_definition)
 
-    for replacement in replacements:
-        declarations = 0
-
-        for idx, request in enumerate(new_chain_definition):
-
-            request_config = request['lake_request']
-
-            logging.debug(f"request: {request}")
+    # The definition is scanned once, each replacement then goes straight to the declarations it matches
+    declarations_index = _declaration_index(
+        chain_definition=new_chain_definition,
+        stage_names={replacement.lake_request_stage_name for replacement in replacements},
+    )
 
-            if replacement.lake_request_stage_name == 'lookup_instructions':
-                # Handle lookup_instructions case
+    for replacement in replacements:
+        stage_name = replacement.lake_request_stage_name
 
-                if replacement.lake_request_stage_name in request_config:
-                    for lookup_idx, lookup_instruction in enumerate(request['lake_request'][replacement.lake_request_stage_name]):
+        # I know the origin of the lookup type name but it still hurts me lol ... :facepalm: Jim
+        positions = declarations_index.pop((stage_name, replacement.type_name), [])
 
-                        # I know the origin of this lookup type name but it still hurts me lol ... :facepalm: Jim
-                        if lookup_instruction['request_type'] == replacement.type_name:
-                            declarations += 1
+        declarations = len(positions)
 
-                            new_chain_definition[idx]['lake_request'][replacement.lake_request_stage_name][lookup_idx] = replacement.replacement_value
-            else:
-                # Handle processor and response
-                search_type_name = 'processor_type'
+        if replacement.max_declarations and declarations > replacement.max_declarations:
+            raise ValueError(f"Too many declarations for {replacement.type_name}")
 
-                if replacement.lake_request_stage_name == 'response_config':
-                    search_type_name = 'response_type'
+        if replacement.min_declarations and declarations < replacement.min_declarations:
+            raise ValueError(f"Chain missing required declaration {replacement.type_name}") 
 
-                logging.debug(f"search_type_name: {search_type_name}")
-                
-                if request_config[replacement.lake_request_stage_name][search_type_name] == replacement.type_name:
-                    declarations += 1
+        replaced_type_name = replacement.replacement_value.get(_type_name_key(stage_name))
 
-                    new_chain_definition[idx]['lake_request'][replacement.lake_request_stage_name] = replacement.replacement_value
+        for idx, lookup_idx in positions:
+            new_chain_definition[idx] = _replace_stage(
+                request=new_chain_definition[idx],
+                stage_name=stage_name,
+                replacement_value=replacement.replacement_value,
+                lookup_idx=lookup_idx,
+            )
 
-            if replacement.max_declarations and declarations > replacement.max_declarations:
-                raise ValueError(f"Too many declarations for {replacement.type_name}")
+            # Later replacements see the replaced value, the same as if the definition was scanned again
+            declarations_index[(stage_name, replaced_type_name)].append((idx, lookup_idx))
 
-        if replacement.min_declarations and declarations < replacement.min_declarations:
-            raise ValueError(f"Chain missing required declaration {replacement.type_name}") 
-    
     return new_chain_definition
 
 
@@ -170,29 +244,32 @@ class ChainRequestManager:
         """
         self.jobs_client = jobs_client
 
-        self.chain_inception_run = ChainInceptionRunClient()
+        self.chain_inception_run = _CHAIN_INCEPTION_RUNS_CLIENT
 
-        self.event_publisher = EventPublisher()
+        self.event_publisher = _EVENT_PUBLISHER
 
-        self.lake_chain_requests = LakeChainRequestsClient()
+        self.lake_chain_requests = _LAKE_CHAIN_REQUESTS_CLIENT
 
-    def submit_chain_request(self, lake_request_id: str, parent_job: Job, request: List[Dict],
-                             callback_event_type: str = 'omnilake_processor_inception_chain_complete',
-                             validate_lock_id: str = None) -> None:
+        # Chain requests buffered by buffer_chain_request until flush is called
+        self._pending_events = []
+
+        self._pending_jobs = []
+
+        self._pending_runs = []
+
+    def _prepare_chain_request(self, lake_request_id: str, parent_job: Job, request: List[Dict],
+                               callback_event_type: str) -> Tuple[Job, ChainInceptionRun, EventBusEvent]:
         """
-        Submits a lake chain request
+        Prepares the job, chain inception run and event of a lake chain request without saving or sending them
 
         Keyword arguments:
         lake_request_id -- The ID of the lake request
         parent_job -- The parent job object
         request -- The chain request
         callback_event_type -- The event type to call when the chain is complete
-        validate_lock_id -- The lock ID to validate
         """
         job = parent_job.create_child(job_type='LAKE_CHAIN_REQUEST')
 
-        self.jobs_client.put(job)
-
         normalized_chain = []
 
         for req in request:
@@ -217,7 +294,7 @@ class ChainRequestManager:
             schema=LakeChainRequestEventBodySchema,
         )
 
-        logging.debug(f"sending chain request: {event_body}")
+        logging.debug(f"prepared chain request: {event_body}")
 
         chain_inception_run = ChainInceptionRun(
             chain_request_id=chain_request_id,
@@ -226,10 +303,94 @@ class ChainRequestManager:
             job_type=job.job_type,
         )
 
-        if validate_lock_id:
-            mutex_client = InceptionMutexClient()
+        event = EventBusEvent(
+            body=event_body,
+            event_type=event_body['event_type'],
+        )
+
+        return job, chain_inception_run, event
+
+    def buffer_chain_request(self, lake_request_id: str, parent_job: Job, request: List[Dict],
+                             callback_event_type: str = 'omnilake_processor_inception_chain_complete') -> str:
+        """
+        Prepares a lake chain request to be submitted by the next flush, returns the chain request ID
+
+        Keyword arguments:
+        lake_request_id -- The ID of the lake request
+        parent_job -- The parent job object
+        request -- The chain request
+        callback_event_type -- The event type to call when the chain is complete
+        """
+        job, chain_inception_run, event = self._prepare_chain_request(
+            lake_request_id=lake_request_id,
+            parent_job=parent_job,
+            request=request,
+            callback_event_type=callback_event_type,
+        )
+
+        self._pending_jobs.append(job)
+
+        self._pending_runs.append(chain_inception_run)
+
+        self._pending_events.append(event)
+
+        return chain_inception_run.chain_request_id
+
+    def flush(self) -> None:
+        """
+        Submits the buffered lake chain requests, the jobs and chain inception runs are saved with batched
+        writes before any of the chain requests are sent
+        """
+        if not self._pending_events:
+            return
+
+        self.jobs_client.batch_put(self._pending_jobs)
 
-            holds_lock = mutex_client.validate_lock(lake_request_id=lake_request_id, lock_id=validate_lock_id)
+        self.chain_inception_run.batch_put(self._pending_runs)
+
+        # Each event is its own request, overlapping them keeps the fan out from scaling linearly with the
+        # number of chains
+        max_workers = min(len(self._pending_events), _MAX_CONCURRENT_EVENT_SUBMISSIONS)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            submissions = [executor.submit(self.event_publisher.submit, event=event) for event in self._pending_events]
+
+            # Surface any submission failure
+            for submission in submissions:
+                submission.result()
+
+        logging.debug(f"submitted {len(self._pending_events)} buffered chain requests")
+
+        self._pending_events = []
+
+        self._pending_jobs = []
+
+        self._pending_runs = []
+
+    def submit_chain_request(self, lake_request_id: str, parent_job: Job, request: List[Dict],
+                             callback_event_type: str = 'omnilake_processor_inception_chain_complete',
+                             validate_lock_id: str = None) -> None:
+        """
+        Submits a lake chain request
+
+        Keyword arguments:
+        lake_request_id -- The ID of the lake request
+        parent_job -- The parent job object
+        request -- The chain request
+        callback_event_type -- The event type to call when the chain is complete
+        validate_lock_id -- The lock ID to validate
+        """
+        job, chain_inception_run, event = self._prepare_chain_request(
+            lake_request_id=lake_request_id,
+            parent_job=parent_job,
+            request=request,
+            callback_event_type=callback_event_type,
+        )
+
+        self.jobs_client.put(job)
+
+        if validate_lock_id:
+            holds_lock = _INCEPTION_MUTEX_CLIENT.validate_lock(lake_request_id=lake_request_id, lock_id=validate_lock_id)
 
             if not holds_lock:
                 logging.info(f"lake request {lake_request_id} does not hold lock {validate_lock_id} ... skipping chain request")
@@ -238,11 +399,6 @@ class ChainRequestManager:
 
         self.chain_inception_run.put(chain_inception_run=chain_inception_run)
 
-        self.event_publisher.submit(
-            event=EventBusEvent(
-                body=event_body,
-                event_type=event_body['event_type'],
-            )
-        )
+        self.event_publisher.submit(event=event)
 
-        logging.debug(f"chain inception run: {chain_inception_run} saved")
\ No newline at end of file
+        logging.debug(f"chain inception run: {chain_inception_run} saved")
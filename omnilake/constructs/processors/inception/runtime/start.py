@@ -23,6 +23,9 @@ from omnilake.constructs.processors.inception.runtime.manager import (
 )
 
 
+_JOBS_CLIENT = JobsClient()
+
+
 _FN_NAME = "omnilake.constructs.processors.chain.start"
 
 
@@ -42,14 +45,12 @@ def handler(event: Dict, context: Dict):
         schema=LakeRequestInternalRequestEventBodySchema,
     )
 
-    omni_jobs = JobsClient()
-
-    job = omni_jobs.get(job_id=event_body.get("parent_job_id"), job_type=event_body.get("parent_job_type"),
+    job = _JOBS_CLIENT.get(job_id=event_body.get("parent_job_id"), job_type=event_body.get("parent_job_type"),
                         consistent_read=True)
 
     child_job = job.create_child(job_type="LAKE_PROCESSOR_CHAIN")
 
-    with omni_jobs.job_execution(job=child_job, skip_completion=True):
+    with _JOBS_CLIENT.job_execution(job=child_job, skip_completion=True):
 
         req_body = event_body["request_body"]
 
@@ -57,7 +58,7 @@ def handler(event: Dict, context: Dict):
 
         entry_distribution_mode = req_body.get("entry_distribution_mode")
 
-        req_mgr = ChainRequestManager(jobs_client=omni_jobs)
+        req_mgr = ChainRequestManager(jobs_client=_JOBS_CLIENT)
 
         standard_replacements = [
             ReplacementDeclaration(
@@ -98,13 +99,16 @@ def handler(event: Dict, context: Dict):
                     replacements=individual_replacement,
                 )
 
-                req_mgr.submit_chain_request(
+                req_mgr.buffer_chain_request(
                     callback_event_type='omnilake_processor_inception_chain_complete',
                     lake_request_id=event_body['lake_request_id'],
                     parent_job=child_job,
                     request=full_chain_definition,
                 )
 
+            # The chains are saved with batched writes instead of two writes per entry
+            req_mgr.flush()
+
         else:
             standard_replacements.append(
                 ReplacementDeclaration(
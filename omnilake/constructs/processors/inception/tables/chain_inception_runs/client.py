@@ -1,7 +1,7 @@
 from datetime import datetime, UTC as utc_tz
 from enum import StrEnum
 from hashlib import sha256
-from typing import List, Optional, Union
+from typing import Iterable, List, Optional, Union
 
 from da_vinci.core.orm import (
     TableClient,
@@ -10,6 +10,8 @@ from da_vinci.core.orm import (
     TableObjectAttributeType,
 )
 
+from omnilake.internal_lib.batch_operations import batch_write_items
+
 
 class InceptionExecutionStatus(StrEnum):
     COMPLETED = "COMPLETED"
@@ -133,6 +135,20 @@ class ChainInceptionRunClient(TableClient):
 
         return results
 
+    def batch_put(self, chain_inception_runs: Iterable[ChainInceptionRun], max_attempts: int = 5) -> None:
+        """
+        Puts multiple runs using batched writes, retrying any unprocessed runs with exponential backoff
+
+        Keyword arguments:
+        chain_inception_runs -- The runs to put
+        max_attempts -- The maximum number of attempts for each batch
+        """
+        batch_write_items(
+            self,
+            [{'PutRequest': {'Item': run.to_dynamodb_item()}} for run in chain_inception_runs],
+            max_attempts=max_attempts,
+        )
+
     def delete(self, run: ChainInceptionRun) -> None:
         """
         Delete a run from the system.
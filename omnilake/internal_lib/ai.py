@@ -7,6 +7,8 @@ from typing import Optional
 
 import boto3
 
+from omnilake.internal_lib.service_clients import SERVICE_CLIENT_CONFIG
+
 
 class ModelIDs(StrEnum):
     """
@@ -40,7 +42,7 @@ class AI:
         """
         Initialize the AI service.
         """
-        self.bedrock = boto3.client(service_name='bedrock-runtime')
+        self.bedrock = boto3.client(service_name='bedrock-runtime', config=SERVICE_CLIENT_CONFIG)
 
         self.default_model_id = default_model_id
 
@@ -3,7 +3,7 @@ AI Engineering Constructs to help control the response of the AI
 '''
 from dataclasses import asdict, dataclass
 from html.parser import HTMLParser
-from typing import List
+from typing import Dict, List
 
 
 @dataclass
@@ -95,14 +95,21 @@ class ResponseParser(HTMLParser):
         ...
         </analysis>
         """
+        self.top_level_tag = 'analysis'
+
         super().__init__()
 
-        self.top_level_tag = 'analysis'
+    def reset(self):
+        """
+        Reset the parser so it can be reused for another response. Called by HTMLParser on init
+        """
+        super().reset()
 
         self.current_insight = None
 
         self.currently_reading = None
 
+        # A new dictionary is used so previously returned insights are left untouched
         self.values = {}
 
         self.reading_response = False
@@ -167,4 +174,17 @@ class ResponseParser(HTMLParser):
         """
         Return the parsed insights
         """
-        return self.values
\ No newline at end of file
+        return self.values
+
+    def parse(self, response: str) -> Dict:
+        """
+        Reset the parser, parse the given response and return the parsed insights
+
+        Keyword arguments:
+        response -- the response to parse
+        """
+        self.reset()
+
+        self.feed(response)
+
+        return self.parsed_insights()
\ No newline at end of file
@@ -0,0 +1,107 @@
+'''
+Batched DynamoDB reads and writes shared by the table clients
+'''
+import time
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from da_vinci.core.orm import TableClient
+
+
+# Maximum number of requests DynamoDB accepts in a single BatchWriteItem call
+BATCH_WRITE_LIMIT = 25
+
+# Maximum number of keys DynamoDB accepts in a single BatchGetItem call
+BATCH_GET_LIMIT = 100
+
+
+def _execute_batch(table_client: TableClient, call: str, request_items: Dict, unprocessed_name: str,
+                   max_attempts: int) -> Iterator[Dict]:
+    """
+    Execute a batch call, resubmitting whatever DynamoDB leaves unprocessed with exponential backoff. Yields
+    the response of every attempt.
+
+    Keyword arguments:
+    table_client -- The client of the table the batch is executed against
+    call -- The name of the batch call on the DynamoDB client
+    request_items -- The RequestItems of the first attempt
+    unprocessed_name -- The response key holding the request items left unprocessed
+    max_attempts -- The maximum number of attempts
+    """
+    attempt = 0
+
+    while request_items:
+        if attempt >= max_attempts:
+            raise Exception(f"Unable to complete {call} on {table_client.table_endpoint_name} after {max_attempts} attempts")
+
+        if attempt > 0:
+            time.sleep(0.05 * (2 ** attempt))
+
+        response = getattr(table_client.client, call)(RequestItems=request_items)
+
+        yield response
+
+        request_items = response.get(unprocessed_name)
+
+        attempt += 1
+
+
+def _key_identity(key: Dict) -> Tuple:
+    """
+    Returns a hashable identity of a DynamoDB key
+
+    Keyword arguments:
+    key -- The DynamoDB key
+    """
+    return tuple(sorted((name, tuple(value.items())) for name, value in key.items()))
+
+
+def batch_get_items(table_client: TableClient, keys: Iterable[Dict], consistent_read: Optional[bool] = False,
+                    projection: Optional[Dict] = None, max_attempts: int = 5) -> Iterator[Dict]:
+    """
+    Get the raw items of the keys using BatchGetItem, chunking the keys to the DynamoDB limit. Keys that
+    do not exist are left out.
+
+    Keyword arguments:
+    table_client -- The client of the table to read from
+    keys -- The DynamoDB keys of the items
+    consistent_read -- Whether or not to use consistent read
+    projection -- The ProjectionExpression and ExpressionAttributeNames to read back, all attributes by default
+    max_attempts -- The maximum number of attempts for each chunk
+    """
+    # BatchGetItem rejects requests that contain the same key twice
+    unique_keys = list({_key_identity(key): key for key in keys}.values())
+
+    table_name = table_client.table_endpoint_name
+
+    for chunk_start in range(0, len(unique_keys), BATCH_GET_LIMIT):
+        request_items = {
+            table_name: {
+                'ConsistentRead': consistent_read,
+                'Keys': unique_keys[chunk_start:chunk_start + BATCH_GET_LIMIT],
+                **(projection or {}),
+            },
+        }
+
+        for response in _execute_batch(table_client, call='batch_get_item', request_items=request_items,
+                                       unprocessed_name='UnprocessedKeys', max_attempts=max_attempts):
+            yield from response.get('Responses', {}).get(table_name, [])
+
+
+def batch_write_items(table_client: TableClient, write_requests: List[Dict], max_attempts: int = 5) -> None:
+    """
+    Execute the write requests using BatchWriteItem, chunking them to the DynamoDB limit
+
+    Keyword arguments:
+    table_client -- The client of the table to write to
+    write_requests -- The PutRequest/DeleteRequest items to execute
+    max_attempts -- The maximum number of attempts for each chunk
+    """
+    for chunk_start in range(0, len(write_requests), BATCH_WRITE_LIMIT):
+        request_items = {
+            table_client.table_endpoint_name: write_requests[chunk_start:chunk_start + BATCH_WRITE_LIMIT],
+        }
+
+        for _ in _execute_batch(table_client, call='batch_write_item', request_items=request_items,
+                                unprocessed_name='UnprocessedItems', max_attempts=max_attempts):
+            pass
@@ -151,6 +151,32 @@ class RawStorageManager(RESTClientBase):
             }
         )
 
+    def create_entries_with_source(self, entries: List[Dict], effective_on: Union[datetime, str] = None):
+        '''
+        Creates multiple original entries along with their sources in a single request. The response
+        body holds one result per entry, in order, with either the entry_id or the error message.
+
+        Keyword arguments:
+        entries -- The entries to create, each a dictionary of the create_entry_with_source arguments
+        effective_on -- The effective date of any entry that does not set its own, sent once for the request
+        '''
+        request_entries = []
+
+        for entry in entries:
+            request_entry = dict(entry)
+
+            if isinstance(request_entry.get('effective_on'), datetime):
+                request_entry['effective_on'] = request_entry['effective_on'].isoformat()
+
+            request_entries.append(request_entry)
+
+        body = {'entries': request_entries}
+
+        if effective_on:
+            body['effective_on'] = effective_on.isoformat() if isinstance(effective_on, datetime) else effective_on
+
+        return self.post(path='/create_entries_with_source', body=body)
+
     def delete_entry(self, entry_id: str):
         '''
         Deletes an entry
@@ -0,0 +1,21 @@
+'''
+Shared configuration for AWS service clients created directly with boto3
+'''
+
+from botocore.config import Config
+
+
+# Adaptive retries back off on throttling instead of retrying immediately, the larger pool keeps
+# concurrent threads from waiting on a connection and keepalive lets warm invocations reuse sockets
+SERVICE_CLIENT_CONFIG = Config(
+    connect_timeout=5,
+    max_pool_connections=50,
+    retries={
+        'max_attempts': 3,
+        'mode': 'adaptive',
+    },
+    tcp_keepalive=True,
+)
+
+# Embedding requests return quickly, a stalled read is retried rather than waited out
+EMBEDDING_CLIENT_CONFIG = SERVICE_CLIENT_CONFIG.merge(Config(read_timeout=15))
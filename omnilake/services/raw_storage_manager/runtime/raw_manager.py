@@ -6,7 +6,7 @@ import logging
 import boto3
 
 from datetime import datetime, UTC as utc_tz
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from botocore.exceptions import ClientError
 
@@ -17,6 +17,7 @@ from da_vinci.core.rest_service_base import SimpleRESTServiceBase, Route
 from da_vinci.exception_trap.client import fn_exception_reporter, ExceptionReporter
 
 from omnilake.internal_lib.naming import SourceResourceName
+from omnilake.internal_lib.service_clients import SERVICE_CLIENT_CONFIG
 
 from omnilake.tables.entries.client import Entry, EntriesClient
 from omnilake.tables.sources.client import Source, SourcesClient
@@ -49,6 +50,11 @@ class RawManager(SimpleRESTServiceBase):
                     method='POST',
                     path='/create_entry_with_source',
                 ),
+                Route(
+                    handler=self.create_entries_with_source,
+                    method='POST',
+                    path='/create_entries_with_source',
+                ),
                 Route(
                     handler=self.delete_entry,
                     method='POST',
@@ -79,7 +85,7 @@ class RawManager(SimpleRESTServiceBase):
 
         self.raw_bucket = setting_value(namespace='omnilake::storage', setting_key='raw_entry_bucket')
 
-        self.s3 = boto3.client('s3')
+        self.s3 = boto3.client('s3', config=SERVICE_CLIENT_CONFIG)
 
     def _set_source_latest_content_entry_id(self, entry_effective_date: datetime, entry_id: str, original_of_source: str):
         """
@@ -142,26 +148,30 @@ class RawManager(SimpleRESTServiceBase):
             else:
                 raise
 
-    def create_entry_with_source(self, content: str, source_arguments: Dict[str, Any], source_type: str,
-                                 effective_on: str = None, update_if_existing: bool = True):
+    def _create_entry_with_source(self, content: str, source_arguments: Dict[str, Any], source_type: str,
+                                  effective_on: str = None, update_if_existing: bool = True,
+                                  source_types_cache: Optional[Dict] = None) -> Tuple[Dict, int]:
         """
-        Creates an entry with a source
+        Creates an entry with a source, returning the response body and status code
 
         Keyword arguments:
         content -- The content of the entry
         source_arguments -- The source arguments
         source_type -- The source type name
         effective_on -- The effective date of the entry
+        update_if_existing -- Whether to create a new entry if the source already exists
+        source_types_cache -- Source types already loaded by the caller, keyed by name
         """
-        source_types = SourceTypesClient()
+        if source_types_cache is None:
+            source_types_cache = {}
 
-        source_type_obj = source_types.get(source_type_name=source_type)
+        if source_type not in source_types_cache:
+            source_types_cache[source_type] = SourceTypesClient().get(source_type_name=source_type)
+
+        source_type_obj = source_types_cache[source_type]
 
         if not source_type_obj:
-            return self.respond(
-                body={'message': 'Source type not found'},
-                status_code=404,
-            )
+            return {'message': 'Source type not found'}, 404
 
         sources = SourcesClient()
 
@@ -169,10 +179,7 @@ class RawManager(SimpleRESTServiceBase):
             attribute_key = source_type_obj.generate_key(source_arguments=source_arguments)
 
         except ValueError as e:
-            return self.respond(
-                body=str(e),
-                status_code=400,
-            )
+            return {'message': str(e)}, 400
 
         existing_source = sources.get_by_attribute_key(attribute_key=attribute_key)
 
@@ -180,10 +187,7 @@ class RawManager(SimpleRESTServiceBase):
             if not update_if_existing:
                 entry_id = existing_source.latest_content_entry_id
 
-                return self.respond(
-                    body={'entry_id': entry_id},
-                    status_code=200
-                )
+                return {'entry_id': entry_id}, 200
 
             source_rn = SourceResourceName(
                 resource_id=existing_source.source_type + '/' + existing_source.source_id
@@ -200,17 +204,75 @@ class RawManager(SimpleRESTServiceBase):
 
             source_rn = SourceResourceName(resource_id=source.source_type + '/' + source.source_id)
 
-        return self.create_entry(
+        entry_id = self._create_entry(
             content=content,
             sources=[str(source_rn)],
             effective_on=effective_on,
             original_of_source=str(source_rn)
         )
 
-    def create_entry(self, content: str, sources: List[str], effective_on: str = None,
-                     original_of_source: str = None):
+        return {'entry_id': entry_id}, 201
+
+    def create_entry_with_source(self, content: str, source_arguments: Dict[str, Any], source_type: str,
+                                 effective_on: str = None, update_if_existing: bool = True):
         """
-        Creates an entry
+        Creates an entry with a source
+
+        Keyword arguments:
+        content -- The content of the entry
+        source_arguments -- The source arguments
+        source_type -- The source type name
+        effective_on -- The effective date of the entry
+        """
+        body, status_code = self._create_entry_with_source(
+            content=content,
+            source_arguments=source_arguments,
+            source_type=source_type,
+            effective_on=effective_on,
+            update_if_existing=update_if_existing,
+        )
+
+        if status_code == 400:
+            # Validation errors have always been returned as the bare message
+            body = body['message']
+
+        return self.respond(body=body, status_code=status_code)
+
+    def create_entries_with_source(self, entries: List[Dict[str, Any]], effective_on: str = None):
+        """
+        Creates multiple entries with their sources in a single request. Responds with one result per
+        requested entry, in the same order, each holding either the entry_id or the error message and
+        status code for that entry.
+
+        Keyword arguments:
+        entries -- The entries to create, each with the same arguments as create_entry_with_source
+        effective_on -- The effective date of any entry that does not set its own
+        """
+        source_types_cache = {}
+
+        results = []
+
+        for entry in entries:
+            body, status_code = self._create_entry_with_source(
+                content=entry['content'],
+                source_arguments=entry['source_arguments'],
+                source_type=entry['source_type'],
+                effective_on=entry.get('effective_on') or effective_on,
+                update_if_existing=entry.get('update_if_existing', True),
+                source_types_cache=source_types_cache,
+            )
+
+            results.append({**body, 'status_code': status_code})
+
+        return self.respond(
+            body={'entries': results},
+            status_code=200,
+        )
+
+    def _create_entry(self, content: str, sources: List[str], effective_on: str = None,
+                      original_of_source: str = None) -> str:
+        """
+        Creates an entry, returning the new entry ID
 
         Keyword arguments:
         content -- The content of the entry
@@ -250,6 +312,26 @@ class RawManager(SimpleRESTServiceBase):
                 original_of_source=original_of_source,
             )
 
+        return entry_id
+
+    def create_entry(self, content: str, sources: List[str], effective_on: str = None,
+                     original_of_source: str = None):
+        """
+        Creates an entry
+
+        Keyword arguments:
+        content -- The content of the entry
+        sources -- The sources of the entry
+        effective_on -- The effective date of the entry
+        original_of_source -- The original source of the entry
+        """
+        entry_id = self._create_entry(
+            content=content,
+            sources=sources,
+            effective_on=effective_on,
+            original_of_source=original_of_source,
+        )
+
         return self.respond(
             body={"entry_id": entry_id},
             status_code=201
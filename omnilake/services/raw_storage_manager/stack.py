@@ -1,6 +1,7 @@
 from os import path
 
 from aws_cdk import (
+    Duration,
     RemovalPolicy,
 )
 
@@ -95,6 +96,8 @@ class LakeRawStorageManagerStack(Stack):
             ],
             scope=self,
             service_name='raw_storage_manager',
+            # Leaves room for batched entry creation requests
+            timeout=Duration.minutes(1),
         )
 
         self.raw_entry_bucket.grant_read_write(self.raw_storage_manager.handler.function)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from datetime import datetime, UTC as utc_tz
 from hashlib import sha256
-from typing import List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 from uuid import uuid4
 
 from da_vinci.core.orm import (
@@ -11,6 +11,8 @@ from da_vinci.core.orm import (
     TableScanDefinition,
 )
 
+from omnilake.internal_lib.batch_operations import batch_get_items
+
 
 class Entry(TableObject):
     table_name = "entries"
@@ -129,6 +131,27 @@ class EntriesClient(TableClient):
             default_object_class=Entry,
         )
 
+    def batch_get(self, entry_ids: Iterable[str], max_attempts: int = 5) -> Dict[str, Entry]:
+        """
+        Get multiple entries using BatchGetItem, chunking the keys to the DynamoDB limit and retrying
+        any unprocessed keys with exponential backoff. Returns the found entries keyed by entry ID,
+        entries that do not exist are left out.
+
+        Keyword arguments:
+        entry_ids -- The unique identifiers of the entries
+        max_attempts -- The maximum number of attempts for each chunk
+        """
+        entries = {}
+
+        keys = [self.default_object_class.gen_dynamodb_key(partition_key_value=entry_id) for entry_id in entry_ids]
+
+        for item in batch_get_items(self, keys, max_attempts=max_attempts):
+            entry = self.default_object_class.from_dynamodb_item(item)
+
+            entries[entry.entry_id] = entry
+
+        return entries
+
     def delete(self, entry: Entry) -> None:
         """
         Delete an entry from the system.
@@ -1,5 +1,10 @@
 from datetime import datetime, UTC as utc_tz
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
 
 from da_vinci.core.orm import (
     TableClient,
@@ -9,6 +14,8 @@ from da_vinci.core.orm import (
     TableScanDefinition,
 )
 
+from omnilake.internal_lib.batch_operations import batch_get_items, batch_write_items
+
 
 class IndexedEntry(TableObject):
     table_name = "indexed_entries"
@@ -80,7 +87,7 @@ class IndexedEntry(TableObject):
         )
 
     @staticmethod
-    def calculate_tag_match_percentage(object_tags: List[str], target_tags: List[str]) -> int:
+    def calculate_tag_match_percentage(object_tags: List[str], target_tags: Iterable[str]) -> int:
         """
         Calculate the match percentage between the object's tags and the target tags.
 
@@ -88,12 +95,50 @@ class IndexedEntry(TableObject):
         object_tags -- The list of tags to compare
         target_tags -- The list of tags to compare
         """
-        matching_tags = set(object_tags) & set(target_tags)
+        if not isinstance(target_tags, (set, frozenset)):
+            target_tags = set(target_tags)
+
+        matching_tags = target_tags.intersection(object_tags)
 
         # Calculate the match percentage
         return len(matching_tags) / len(target_tags) * 100
 
-    def calculate_score(self, target_tags: List[str]) -> int:
+    @staticmethod
+    def calculate_tag_match_percentages(tag_lists: List[List[str]], target_tags: Iterable[str]) -> np.ndarray:
+        """
+        Calculate the match percentage of many tag lists against the target tags in a single vectorized
+        pass. Produces the same values as calculate_tag_match_percentage for each tag list.
+
+        Keyword arguments:
+        tag_lists -- The tag lists to compare
+        target_tags -- The list of tags to compare
+        """
+        target_tags = frozenset(target_tags)
+
+        if not target_tags:
+            return np.zeros(len(tag_lists))
+
+        unique_tag_lists = [set(tags) for tags in tag_lists]
+
+        tag_counts = np.fromiter((len(tags) for tags in unique_tag_lists), dtype=np.int64, count=len(tag_lists))
+
+        # Integer encode the tags against the target tags, -1 marking tags that aren't targeted, so the
+        # match check is an integer comparison instead of a string comparison
+        target_tag_ids = {tag: idx for idx, tag in enumerate(target_tags)}
+
+        encoded_tags = np.fromiter(
+            (target_tag_ids.get(tag, -1) for tags in unique_tag_lists for tag in tags),
+            dtype=np.int32,
+            count=int(tag_counts.sum()),
+        )
+
+        tag_owners = np.repeat(np.arange(len(tag_lists)), tag_counts)
+
+        match_counts = np.bincount(tag_owners, weights=encoded_tags >= 0, minlength=len(tag_lists))
+
+        return match_counts / len(target_tags) * 100
+
+    def calculate_score(self, target_tags: Iterable[str]) -> int:
         """
         Calculate the match percentage based on the target tags.
 
@@ -121,6 +166,76 @@ class IndexedEntriesClient(TableClient):
             deployment_id=deployment_id,
         )
 
+    def _batch_get(self, archive_id: str, entry_ids: Iterable[str], projection: Optional[Dict] = None,
+                   max_attempts: int = 5) -> Iterator[Dict]:
+        """
+        Get the raw items of multiple entries of an archive using BatchGetItem, chunking the keys to the
+        DynamoDB limit and retrying any unprocessed keys with exponential backoff. Entries that are not
+        indexed into the archive are left out.
+
+        Keyword arguments:
+        archive_id -- The ID of the archive
+        entry_ids -- The IDs of the entries
+        projection -- The ProjectionExpression and ExpressionAttributeNames to read back, all attributes by default
+        max_attempts -- The maximum number of attempts for each chunk
+        """
+        keys = [
+            self.default_object_class.gen_dynamodb_key(partition_key_value=archive_id, sort_key_value=entry_id)
+            for entry_id in entry_ids
+        ]
+
+        return batch_get_items(self, keys, projection=projection, max_attempts=max_attempts)
+
+    def batch_get_tags(self, archive_id: str, entry_ids: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Get the tags of multiple entries of an archive using batched reads. Only the entry ID and tags are
+        read back from DynamoDB and no IndexedEntry objects are built. Returns the tags keyed by entry ID,
+        entries that are not indexed into the archive are left out.
+
+        Keyword arguments:
+        archive_id -- The ID of the archive
+        entry_ids -- The IDs of the entries
+        """
+        deserializer = TypeDeserializer()
+
+        projection = {
+            "ProjectionExpression": "#entry_id, #tags",
+            "ExpressionAttributeNames": {"#entry_id": "EntryId", "#tags": "Tags"},
+        }
+
+        return {
+            item["EntryId"]["S"]: list(deserializer.deserialize(item["Tags"])) if "Tags" in item else []
+            for item in self._batch_get(archive_id=archive_id, entry_ids=entry_ids, projection=projection)
+        }
+
+    def batch_delete(self, indexed_entries: Iterable[IndexedEntry]) -> None:
+        """
+        Delete multiple entries from the table using batched writes.
+
+        Keyword arguments:
+        indexed_entries -- The entries to delete
+        """
+        batch_write_items(self, [
+            {
+                'DeleteRequest': {
+                    'Key': self.default_object_class.gen_dynamodb_key(
+                        partition_key_value=entry.archive_id,
+                        sort_key_value=entry.entry_id,
+                    ),
+                },
+            }
+            for entry in indexed_entries
+        ])
+
+    def batch_put(self, entries: Iterable[IndexedEntry]) -> None:
+        """
+        Put multiple entries into the table using batched writes.
+
+        Keyword arguments:
+        entries -- The entries to put
+        """
+        batch_write_items(self, [{'PutRequest': {'Item': entry.to_dynamodb_item()}} for entry in entries])
+
     def delete(self, indexed_entry: IndexedEntry) -> None:
         """
         Delete an entry from the table.
@@ -131,6 +246,63 @@ class IndexedEntriesClient(TableClient):
         """
         return self.delete_object(table_object=indexed_entry)
 
+    def get_tags_by_archive(self, archive_id: str) -> Iterator[List[Tuple[str, List[str]]]]:
+        """
+        Get the entry ID and tags of every entry indexed into an archive, one page at a time. Only the
+        two attributes are read back from DynamoDB and no IndexedEntry objects are built, which keeps the
+        per-entry transfer and deserialization cost of tag scoring down.
+
+        Keyword arguments:
+        archive_id -- The ID of the archive
+        """
+        deserializer = TypeDeserializer()
+
+        paginator = self.client.get_paginator("query")
+
+        pages = paginator.paginate(
+            TableName=self.table_endpoint_name,
+            KeyConditionExpression="ArchiveId = :archive_id",
+            ExpressionAttributeValues={":archive_id": {"S": archive_id}},
+            ProjectionExpression="#entry_id, #tags",
+            ExpressionAttributeNames={"#entry_id": "EntryId", "#tags": "Tags"},
+        )
+
+        for page in pages:
+            yield [
+                (
+                    item["EntryId"]["S"],
+                    list(deserializer.deserialize(item["Tags"])) if "Tags" in item else [],
+                )
+                for item in page.get("Items", [])
+            ]
+
+    def get_by_original_source(self, original_of_source: str,
+                               exclude_entry_id: Optional[str] = None) -> List[IndexedEntry]:
+        """
+        Get all indexed entries, across archives, that are the original content of the given source.
+
+        Keyword arguments:
+        original_of_source -- The source resource name
+        exclude_entry_id -- An entry ID to leave out of the results
+        """
+        params = {
+            "KeyConditionExpression": "OriginalOfSource = :original_of_source",
+            "ExpressionAttributeValues": {":original_of_source": {"S": original_of_source}},
+            "IndexName": "original_of_source-index",
+        }
+
+        if exclude_entry_id:
+            params["FilterExpression"] = "EntryId <> :exclude_entry_id"
+
+            params["ExpressionAttributeValues"][":exclude_entry_id"] = {"S": exclude_entry_id}
+
+        indexed_entries = []
+
+        for page in self.paginated(call="query", parameters=params):
+            indexed_entries.extend(page)
+
+        return indexed_entries
+
     def get(self, archive_id: str, entry_id: str) -> Optional[IndexedEntry]:
         """
         Get an entry from the table.
@@ -141,6 +313,29 @@ class IndexedEntriesClient(TableClient):
         """
         return self.get_object(partition_key_value=archive_id, sort_key_value=entry_id)
 
+    def put_if_absent(self, entry: IndexedEntry) -> bool:
+        """
+        Put an entry into the table only if it has not already been indexed. Returns True if the
+        entry was written, False if it already existed.
+
+        Keyword arguments:
+        entry -- The entry to put
+        """
+        try:
+            self.client.put_item(
+                TableName=self.table_endpoint_name,
+                Item=entry.to_dynamodb_item(),
+                ConditionExpression="attribute_not_exists(EntryId)",
+            )
+
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+
+            raise
+
     def put(self, entry: IndexedEntry) -> None:
         """
         Put an entry into the table.
@@ -1,5 +1,7 @@
 from constructs import Construct
 
+from aws_cdk import aws_dynamodb as cdk_dynamodb
+
 from da_vinci_cdk.constructs.dynamodb import DynamoDBTable
 from da_vinci_cdk.stack import Stack
 
@@ -19,4 +21,12 @@ class IndexedEntriesTable(Stack):
         self.table = DynamoDBTable.from_orm_table_object(
             scope=self,
             table_object=IndexedEntry,
+        )
+
+        self.table.table.add_global_secondary_index(
+            index_name="original_of_source-index",
+            partition_key=cdk_dynamodb.Attribute(
+                name='OriginalOfSource',
+                type=cdk_dynamodb.AttributeType.STRING
+            ),
         )
\ No newline at end of file
@@ -2,7 +2,7 @@ from contextlib import contextmanager
 from datetime import datetime, timedelta, UTC as utc_tz
 from enum import StrEnum
 from uuid import uuid4
-from typing import Dict, Generator, Optional
+from typing import Dict, Generator, Iterable, Optional
 
 from da_vinci.core.orm import (
     TableClient,
@@ -12,6 +12,8 @@ from da_vinci.core.orm import (
     TableScanDefinition,
 )
 
+from omnilake.internal_lib.batch_operations import batch_write_items
+
 
 class JobStatus(StrEnum):
     PENDING = 'PENDING'
@@ -148,6 +150,20 @@ class JobsClient(TableClient):
             default_object_class=Job,
         )
 
+    def batch_put(self, jobs: Iterable[Job], max_attempts: int = 5) -> None:
+        """
+        Puts multiple jobs using batched writes, retrying any unprocessed jobs with exponential backoff
+
+        Keyword arguments:
+        jobs -- The jobs to put
+        max_attempts -- The maximum number of attempts for each batch
+        """
+        batch_write_items(
+            self,
+            [{'PutRequest': {'Item': job.to_dynamodb_item()}} for job in jobs],
+            max_attempts=max_attempts,
+        )
+
     @contextmanager
     def get_and_update(self, job_type: str, job_id: str) -> Generator[Job, None, None]:
         """
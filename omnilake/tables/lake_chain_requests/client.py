@@ -1,6 +1,6 @@
 from datetime import datetime, UTC as utc_tz
 from enum import StrEnum
-from typing import Dict, List, Optional, Set, Union
+from typing import Dict, Iterable, List, Optional, Set, Union
 from uuid import uuid4
 
 from botocore.exceptions import ClientError as DynamoDBClientError
@@ -13,6 +13,8 @@ from da_vinci.core.orm import (
     TableScanDefinition,
 )
 
+from omnilake.internal_lib.batch_operations import batch_get_items
+
 
 class LakeChainRequestStatus(StrEnum):
     COMPLETED = 'COMPLETED'
@@ -296,6 +298,32 @@ class LakeChainRequestsClient(TableClient):
     
         return updated_remaining_requests
 
+    def batch_get(self, chain_request_ids: Iterable[str], consistent_read: Optional[bool] = False,
+                  max_attempts: int = 5) -> Dict[str, LakeChainRequest]:
+        """
+        Get multiple lake chain requests using BatchGetItem, chunking the keys to the DynamoDB limit and retrying
+        any unprocessed keys with exponential backoff. Returns the found lake chain requests keyed by ID, those that
+        do not exist are left out.
+
+        Keyword Arguments:
+            chain_request_ids -- The IDs of the lake chain requests.
+            consistent_read -- Whether or not to use consistent read.
+            max_attempts -- The maximum number of attempts for each chunk.
+        """
+        results = {}
+
+        keys = [
+            self.default_object_class.gen_dynamodb_key(partition_key_value=chain_request_id)
+            for chain_request_id in chain_request_ids
+        ]
+
+        for item in batch_get_items(self, keys, consistent_read=consistent_read, max_attempts=max_attempts):
+            result = self.default_object_class.from_dynamodb_item(item)
+
+            results[result.chain_request_id] = result
+
+        return results
+
     def delete(self, request_chain: LakeChainRequest) -> None:
         """
         Delete an lake request chain object from the table
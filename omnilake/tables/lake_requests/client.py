@@ -1,6 +1,6 @@
 from datetime import datetime, UTC as utc_tz
 from enum import StrEnum
-from typing import Dict, List, Optional, Set, Union
+from typing import Dict, Iterable, List, Optional, Set, Union
 from uuid import uuid4
 
 from da_vinci.core.orm import (
@@ -11,6 +11,8 @@ from da_vinci.core.orm import (
     TableScanDefinition,
 )
 
+from omnilake.internal_lib.batch_operations import batch_get_items
+
 from da_vinci.core.immutable_object import ObjectBody
 
 
@@ -262,6 +264,32 @@ class LakeRequestsClient(TableClient):
     
         return updated_remaining_lookups
 
+    def batch_get(self, lake_request_ids: Iterable[str], consistent_read: Optional[bool] = False,
+                  max_attempts: int = 5) -> Dict[str, LakeRequest]:
+        """
+        Get multiple lake requests using BatchGetItem, chunking the keys to the DynamoDB limit and retrying
+        any unprocessed keys with exponential backoff. Returns the found lake requests keyed by ID, those that
+        do not exist are left out.
+
+        Keyword Arguments:
+            lake_request_ids -- The IDs of the lake requests.
+            consistent_read -- Whether or not to use consistent read.
+            max_attempts -- The maximum number of attempts for each chunk.
+        """
+        results = {}
+
+        keys = [
+            self.default_object_class.gen_dynamodb_key(partition_key_value=lake_request_id)
+            for lake_request_id in lake_request_ids
+        ]
+
+        for item in batch_get_items(self, keys, consistent_read=consistent_read, max_attempts=max_attempts):
+            result = self.default_object_class.from_dynamodb_item(item)
+
+            results[result.lake_request_id] = result
+
+        return results
+
     def decrement_remaining_lookups(self, lake_request_id: str) -> int:
         """
         Decrement the remaining lookups for the lake request
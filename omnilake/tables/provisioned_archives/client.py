@@ -1,6 +1,8 @@
+import time
+
 from datetime import datetime, UTC as utc_tz
 from enum import StrEnum
-from typing import Optional, Union
+from typing import Dict, Optional, Tuple, Union
 
 from da_vinci.core.orm import (
     TableClient,
@@ -105,6 +107,12 @@ class Archive(TableObject):
 
 
 class ArchivesClient(TableClient):
+    # Archives cached by get(use_cache=True), shared across clients in the execution environment.
+    # Maps archive_id to a tuple of (expires_at, archive)
+    _cache: Dict[str, Tuple[float, Archive]] = {}
+
+    cache_ttl_seconds = 60
+
     def __init__(self, app_name: Optional[str] = None, deployment_id: Optional[str] = None):
         super().__init__(
             app_name=app_name,
@@ -119,16 +127,30 @@ class ArchivesClient(TableClient):
         Keyword arguments:
         archive -- The archive to delete
         """
+        self._cache.pop(archive.archive_id, None)
+
         self.delete_object(table_object=archive)
 
-    def get(self, archive_id: str) -> Union[Archive, None]:
+    def get(self, archive_id: str, use_cache: bool = False) -> Union[Archive, None]:
         """
         Get an archive by ID
 
         Keyword arguments:
         archive_id -- The ID of the archive
+        use_cache -- Whether an archive retrieved within the last cache_ttl_seconds can be returned
         """
-        return self.get_object(partition_key_value=archive_id)
+        if use_cache:
+            cached = self._cache.get(archive_id)
+
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+        archive = self.get_object(partition_key_value=archive_id)
+
+        if archive:
+            self._cache[archive_id] = (time.monotonic() + self.cache_ttl_seconds, archive)
+
+        return archive
 
     def put(self, archive: Archive) -> None:
         """
@@ -137,4 +159,6 @@ class ArchivesClient(TableClient):
         Keyword arguments:
         archive -- The archive to put
         """
+        self._cache.pop(archive.archive_id, None)
+
         return self.put_object(table_object=archive)
\ No newline at end of file